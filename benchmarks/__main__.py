@@ -0,0 +1,51 @@
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from benchmarks.run import run, compare
+from benchmarks import importtime
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Measure how explorer scales on a synthetic system")
+    parser.add_argument("--boards", type=int, default=4, help="number of boards in the system")
+    parser.add_argument("--parts", type=int, default=500, help="number of chips per board")
+    parser.add_argument("--pins", type=int, default=16, help="number of pins per chip")
+    parser.add_argument("--nets", type=int, default=2000, help="number of nets per board")
+    parser.add_argument("--fpgas", type=int, default=1, help="number of fpgas per board")
+    parser.add_argument("--fpga-pins", type=int, default=2000, help="number of pins per fpga")
+    parser.add_argument("--connector-pins", type=int, default=100, help="number of pins of the connector mating boards together")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="do not trace memory, for timings without the tracemalloc overhead")
+    parser.add_argument("--importtime", action="store_true", help="also measure how long importing explorer takes")
+    parser.add_argument("--output", help="save the results to this json file")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare the results against a json file saved earlier")
+    args = parser.parse_args(argv)
+
+    results = run(boards=args.boards, parts=args.parts, pins=args.pins, nets=args.nets,
+                  fpgas=args.fpgas, fpga_pins=args.fpga_pins, connector_pins=args.connector_pins,
+                  seed=args.seed, memory=not args.no_memory)
+
+    for phase in results["phases"]:
+        peak = "" if phase["peak_bytes"] is None else f"{phase['peak_bytes'] / 2**20:10.1f} MiB"
+        print(f"{phase['name']:<16}{phase['seconds']:10.3f} s {peak}")
+
+    if args.importtime:
+        results["importtime"] = importtime.run()
+        for result in results["importtime"]:
+            print(f"{result['statement']:<32}{result['seconds']:10.3f} s")
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        print()
+        print(compare(baseline, results))
+
+if __name__ == "__main__":
+    sys.exit(main())
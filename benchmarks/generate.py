@@ -0,0 +1,252 @@
+
+from __future__ import annotations
+
+import os
+import random
+
+class SyntheticBoard:
+    """
+    A made up board, to measure how explorer scales.
+
+    A synthetic board has a connector J1 to mate it with other boards, a
+    number of generic chips U1, U2 ... and optionally a few fpgas FPGA1,
+    FPGA2 ... Every pin is either left unconnected or is put on one of the
+    nets, at random. GND collects a fair share of the pins, as it would on a
+    real board. The same seed always gives the same board.
+
+    The board can be written as eagle reports, as an orcad netlist, and the
+    fpgas as xilinx io reports, so that every reader gets to read the very
+    same board.
+    ```
+    board = SyntheticBoard('brd0', parts=1000, pins=16, nets=2000, fpgas=2)
+    board.write_eagle('out/')
+    board.write_orcad('out/brd0')
+    board.write_xlnx_io('out/')
+    ```
+    """
+    def __init__(self, name: str, parts: int = 100, pins: int = 8, nets: int = 200,
+                 fpgas: int = 0, fpga_pins: int = 2000, connector_pins: int = 100,
+                 unconnected: float = 0.05, seed: int = 0) -> None:
+        self.name = name
+        rng = random.Random(f"{name}-{seed}")
+
+        # (refdes, kind, [pin number])
+        self.components: list[tuple[str, str, list[str]]] = list()
+        self.components.append(('J1', 'connector', [str(i+1) for i in range(connector_pins)]))
+        for i in range(parts):
+            self.components.append((f'U{i+1}', 'chip', [str(j+1) for j in range(pins)]))
+        for i in range(fpgas):
+            self.components.append((f'FPGA{i+1}', 'fpga', ball_grid(fpga_pins)))
+
+        # net name -> [(refdes, pin number)]
+        self.nets: dict[str, list[tuple[str, str]]] = dict()
+        connector = [f'J1_{number}' for number in self.components[0][2]]
+        net_names = ['GND'] + [f'N{i}' for i in range(nets)] + connector
+        for refdes, kind, numbers in self.components:
+            for i, number in enumerate(numbers):
+                if kind == 'connector':
+                    net = connector[i]
+                elif rng.random() < unconnected:
+                    continue
+                elif rng.random() < 0.1:
+                    net = 'GND'
+                else:
+                    net = rng.choice(net_names)
+                self.nets.setdefault(net, []).append((refdes, number))
+
+    @property
+    def fpgas(self):
+        return [refdes for refdes, kind, _ in self.components if kind == 'fpga']
+
+    def pin_count(self):
+        return sum(len(numbers) for _, _, numbers in self.components)
+
+    def write_eagle(self, folder: str):
+        """
+        Write {name}.parts, {name}.pins and {name}.nets, like eagle 9.6.2 would
+        """
+        os.makedirs(folder, exist_ok=True)
+        connected = {node: net for net, nodes in self.nets.items() for node in nodes}
+
+        rows = []
+        for refdes, kind, numbers in self.components:
+            device, package = self._device(kind, len(numbers))
+            rows.append([refdes, '' if kind == 'connector' else kind.upper(), device, package, 'synthetic', '1'])
+        self._write_eagle_report(os.path.join(folder, f'{self.name}.parts'), 'Partlist',
+                                 ['Part', 'Value', 'Device', 'Package', 'Library', 'Sheet'], rows, blank_after=None)
+
+        rows = []
+        for refdes, kind, numbers in self.components:
+            for i, number in enumerate(numbers):
+                net = connected.get((refdes, number), '*** unconnected ***')
+                rows.append(['' if i != 0 else refdes, number, f'P{number}', 'io', net])
+        self._write_eagle_report(os.path.join(folder, f'{self.name}.pins'), 'Pinlist',
+                                 ['Part', 'Pad', 'Pin', 'Dir', 'Net'], rows, blank_after=0)
+
+        rows = []
+        for net in sorted(self.nets):
+            for i, (refdes, number) in enumerate(sorted(self.nets[net])):
+                rows.append(['' if i != 0 else net, refdes, number, f'P{number}', '1'])
+        self._write_eagle_report(os.path.join(folder, f'{self.name}.nets'), 'Netlist',
+                                 ['Net', 'Part', 'Pad', 'Pin', 'Sheet'], rows, blank_after=0)
+
+    def _write_eagle_report(self, file: str, filetype: str, keys: list[str], rows: list[list[str]], blank_after: int | None):
+        widths = [max([len(key) + 3] + [len(row[i]) + 1 for row in rows]) for i, key in enumerate(keys)]
+
+        def line(cells):
+            return ' '.join(cell.ljust(width) for cell, width in zip(cells, widths)).rstrip() + '\n'
+
+        with open(file, 'w') as f:
+            f.write(f'{filetype}\n\n')
+            f.write(f'Exported from {self.name}.sch at 21/11/2020 11:31\n\n')
+            f.write('EAGLE Version 9.6.2 Copyright (c) 1988-2020 Autodesk, Inc.\n\n')
+            if filetype == 'Partlist':
+                f.write('Assembly variant: \n\n')
+            f.write(line(keys))
+            f.write('\n')
+            for i, row in enumerate(rows):
+                # A new part, or a new net, is preceded by an empty line
+                if blank_after is not None and row[blank_after] != '' and i != 0:
+                    f.write('\n')
+                f.write(line(row))
+
+    def write_orcad(self, folder: str):
+        """
+        Write pstchip.dat, pstxprt.dat and pstxnet.dat, like orcad capture would
+        """
+        os.makedirs(folder, exist_ok=True)
+        root = self.name.upper()
+
+        primitives = dict()
+        for refdes, kind, numbers in self.components:
+            primitives.setdefault(self._primitive(kind, len(numbers)), (kind, numbers))
+
+        with open(os.path.join(folder, 'pstchip.dat'), 'w') as f:
+            f.write('FILE_TYPE=LIBRARY_PARTS;\n')
+            f.write('{ Using PSTWRITER 17.2.0 d001Mar-02-2020 at 12:59:07}\n')
+            for primitive, (kind, numbers) in primitives.items():
+                device, package = self._device(kind, len(numbers))
+                f.write(f"primitive '{primitive}';\n")
+                f.write("  pin\n")
+                for number in numbers:
+                    f.write(f"    'P{number}':\n")
+                    f.write(f"      PIN_NUMBER='({number})';\n")
+                    f.write("      PINUSE='UNSPEC';\n")
+                f.write("  end_pin;\n")
+                f.write("  body\n")
+                f.write(f"    PART_NAME='{device}';\n")
+                f.write(f"    JEDEC_TYPE='{package}';\n")
+                f.write(f"    CLASS='{ {'connector': 'IO', 'chip': 'IC', 'fpga': 'IC'}[kind] }';\n")
+                f.write(f"    VALUE='{kind.upper()}';\n")
+                f.write("  end_body;\n")
+                f.write("end_primitive;\n")
+            f.write('END.\n')
+
+        with open(os.path.join(folder, 'pstxprt.dat'), 'w') as f:
+            f.write('FILE_TYPE = EXPANDEDPARTLIST;\n')
+            f.write('{ Using PSTWRITER 17.2.0 d001Mar-02-2020 at 12:59:07 }\n')
+            f.write('DIRECTIVES\n')
+            f.write(" PST_VERSION='PST_HDL_CENTRIC_VERSION_0';\n")
+            f.write(f" ROOT_DRAWING='{root}';\n")
+            f.write(" POST_TIME='Jul  8 2019 18:16:32';\n")
+            f.write(" SOURCE_TOOL='CAPTURE_WRITER';\n")
+            f.write('END_DIRECTIVES;\n')
+            for i, (refdes, kind, numbers) in enumerate(self.components):
+                f.write('\nPART_NAME\n')
+                f.write(f" {refdes} '{self._primitive(kind, len(numbers))}':;\n\n")
+                f.write('SECTION_NUMBER 1\n')
+                f.write(f" '@{root}.SCHEMATIC1(SCH_1):INS{i}@{root}.{kind.upper()}.NORMAL(CHIPS)':\n")
+                f.write(f" C_PATH='@{root.lower()}.schematic1(sch_1):ins{i}@{root.lower()}.{kind}.normal\\(chips)',\n")
+                f.write(" PRIM_FILE='.\\pstchip.dat',\n")
+                f.write(" SECTION='';\n")
+            f.write('\nEND.\n')
+
+        instances = {refdes: (i, kind) for i, (refdes, kind, _) in enumerate(self.components)}
+        with open(os.path.join(folder, 'pstxnet.dat'), 'w') as f:
+            f.write('FILE_TYPE = EXPANDEDNETLIST;\n')
+            f.write('{ Using PSTWRITER 17.2.0 d001 on Mar-02-2020 at 12:59:06 }\n')
+            for net, nodes in self.nets.items():
+                f.write('NET_NAME\n')
+                f.write(f"'{net}'\n")
+                f.write(f" '@{root}.SCHEMATIC1(SCH_1):{net}':\n")
+                f.write(f" C_SIGNAL='@{root.lower()}.schematic1(sch_1):{net.lower()}';\n")
+                for refdes, number in nodes:
+                    i, kind = instances[refdes]
+                    f.write(f'NODE_NAME\t{refdes} {number}\n')
+                    f.write(f" '@{root}.SCHEMATIC1(SCH_1):INS{i}@{root}.{kind.upper()}.NORMAL(CHIPS)':\n")
+                    f.write(f" 'P{number}':;\n")
+            f.write('END.\n')
+
+    def write_xlnx_io(self, folder: str):
+        """
+        Write one {name}_{fpga}_io.rpt per fpga, like vivado's report_io would.
+        Every pin of the fpga that is on a net is a top level signal.
+
+        Return the path of the reports, in the same order as `fpgas`.
+        """
+        os.makedirs(folder, exist_ok=True)
+        connected = {node for nodes in self.nets.values() for node in nodes}
+
+        reports = []
+        for refdes, kind, numbers in self.components:
+            if kind != 'fpga':
+                continue
+
+            rows = []
+            for i, number in enumerate(numbers):
+                signal = f'{refdes.lower()}_io[{i}]' if (refdes, number) in connected else ''
+                rows.append([number, signal, 'High Range', f'IO_{i}', 'User IO' if signal == '' else 'INPUT', 'LVCMOS33' if signal else ''])
+
+            keys = ['Pin Number', 'Signal Name', 'Bank Type', 'Pin Name', 'Use', 'IO Standard']
+            widths = [max([len(key)] + [len(row[i]) for row in rows]) for i, key in enumerate(keys)]
+            delimiter = '+' + '+'.join('-' * (width + 2) for width in widths) + '+\n'
+
+            def line(cells):
+                return '|' + '|'.join(f' {cell.ljust(width)} ' for cell, width in zip(cells, widths)) + '|\n'
+
+            file = os.path.join(folder, f'{self.name}_{refdes}_io.rpt')
+            with open(file, 'w') as f:
+                f.write('Copyright 1986-2019 Xilinx, Inc. All Rights Reserved.\n')
+                f.write(f'| Design       : {self.name}_{refdes.lower()}\n\n')
+                f.write('IO Information\n\n')
+                f.write('1. IO Assignments by Package Pin\n')
+                f.write('--------------------------------\n\n')
+                f.write(delimiter)
+                f.write(line(keys))
+                f.write(delimiter)
+                for row in rows:
+                    f.write(line(row))
+                f.write(delimiter)
+            reports.append(file)
+
+        return reports
+
+    def _device(self, kind: str, count: int):
+        return {
+            'connector': (f'CONN-{count}', f'HDR{count}'),
+            'chip':      (f'CHIP-{count}', f'PKG{count}'),
+            'fpga':      (f'FPGA-{count}', f'BGA{count}'),
+        }[kind]
+
+    def _primitive(self, kind: str, count: int):
+        return f'{kind.upper()}_{count}'
+
+def ball_grid(count: int):
+    """
+    Pin numbers of a ball grid array with that many balls: A1, A2 ... AA1 ...
+    Like real packages, letters I, O, Q, S, X and Z are not used for rows.
+    """
+    letters = 'ABCDEFGHJKLMNPRTUVWY'
+    columns = 1
+    while columns * columns < count:
+        columns += 1
+
+    def row(i):
+        name = ''
+        i += 1
+        while i > 0:
+            i, r = divmod(i - 1, len(letters))
+            name = letters[r] + name
+        return name
+
+    return [f'{row(i // columns)}{i % columns + 1}' for i in range(count)]
@@ -0,0 +1,59 @@
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+
+# What short lived scripts typically start with
+ENTRY_POINTS = [
+    "import explorer",
+    "from explorer import read_rtl",
+    "from explorer import read_eagle",
+    "from explorer import read_orcad",
+    "from explorer import write_html",
+    "from explorer import *",
+]
+
+def importtime(statement: str):
+    """
+    Return the time python -X importtime reports for the statement, in
+    seconds, and the (module, self seconds) of every module it imported
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                             capture_output=True, text=True, check=True)
+    total = 0
+    modules = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(own) / 1e6))
+        # Modules imported at the top level are not indented
+        if not name.startswith("  "):
+            total += int(cumulative) / 1e6
+    return total, modules
+
+def run(repeats: int = 5):
+    """
+    Measure every entry point, best of a few runs. Returns a json friendly
+    list of {statement, seconds, slowest}
+    """
+    results = []
+    for statement in ENTRY_POINTS:
+        best, modules = min((importtime(statement) for _ in range(repeats)), key=lambda x: x[0])
+        slowest = sorted(modules, key=lambda x: x[1], reverse=True)[:5]
+        results.append({"statement": statement, "seconds": best, "slowest": slowest})
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.importtime", description="Measure how long importing explorer takes")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for result in run(args.repeats):
+        slowest = ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in result["slowest"][:3])
+        print(f"{result['statement']:<36}{result['seconds'] * 1000:8.1f} ms   ({slowest})")
+
+if __name__ == "__main__":
+    sys.exit(main())
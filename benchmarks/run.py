@@ -0,0 +1,125 @@
+
+from __future__ import annotations
+
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+
+from explorer import *
+from benchmarks.generate import SyntheticBoard
+
+@contextmanager
+def phase(name: str, results: list[dict], memory: bool = True):
+    """
+    Measure the time, and the peak memory if asked to, spent in the block
+    """
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    yield
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    results.append({"name": name, "seconds": seconds, "peak_bytes": peak})
+
+def run(boards: int = 4, parts: int = 500, pins: int = 16, nets: int = 2000,
+        fpgas: int = 1, fpga_pins: int = 2000, connector_pins: int = 100,
+        seed: int = 0, memory: bool = True, folder: str | None = None):
+    """
+    Generate a synthetic system and measure each phase of loading it, and of
+    writing its reports.
+
+    The boards are mated in pairs: J1 of brd0 with J1 of brd1, J1 of brd2 with
+    J1 of brd3 and so on. Each fpga gets its rtl from its io report.
+
+    Returns a json friendly dict with the parameters and the phases.
+    """
+    parameters = {"boards": boards, "parts": parts, "pins": pins, "nets": nets, "fpgas": fpgas,
+                  "fpga_pins": fpga_pins, "connector_pins": connector_pins, "seed": seed}
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = tmp if folder is None else folder
+
+        with phase("generate", results, memory):
+            synthetic = [SyntheticBoard(f"brd{i}", parts=parts, pins=pins, nets=nets, fpgas=fpgas, fpga_pins=fpga_pins,
+                                        connector_pins=connector_pins, seed=seed) for i in range(boards)]
+            reports = []
+            for brd in synthetic:
+                brd.write_eagle(os.path.join(folder, "eagle"))
+                brd.write_orcad(os.path.join(folder, "orcad", brd.name))
+                reports += brd.write_xlnx_io(os.path.join(folder, "xlnx"))
+
+        system = System("synthetic")
+
+        with phase("read_eagle", results, memory):
+            eagle = [read_eagle(*[os.path.join(folder, "eagle", f"{brd.name}.{ext}") for ext in ["nets", "pins", "parts"]],
+                                symbols=system.symbols) for brd in synthetic]
+
+        with phase("read_orcad", results, memory):
+            orcad = [read_orcad(os.path.join(folder, "orcad", brd.name), symbols=system.symbols) for brd in synthetic]
+        del orcad
+
+        with phase("read_rtl", results, memory):
+            rtls = read_rtls(reports)
+
+        with phase("assemble", results, memory):
+            for brd, board in zip(synthetic, eagle):
+                board.identifier = brd.name
+                system.add_board(board)
+
+            connectors = [Interface.from_components("J1", [board.get_component("J1")]) for board in eagle]
+            connect_many(zip(connectors[0::2], connectors[1::2]))
+
+            fpga_components = [board.get_component(fpga) for brd, board in zip(synthetic, eagle) for fpga in brd.fpgas]
+            for fpga, rtl in zip(fpga_components, rtls):
+                rtl.name = f"{fpga.parent.identifier}_{fpga.refdes}".lower()
+            bind_rtls(zip(fpga_components, rtls))
+
+        with phase("netlist", results, memory):
+            netlist = Netlist(system)
+        del netlist
+
+        with phase("write_html", results, memory):
+            write_html(system, os.path.join(folder, "html"))
+
+        with phase("write_json", results, memory):
+            write_json(system, os.path.join(folder, "system.json"))
+
+    return {
+        "explorer": {"commit": _commit()},
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "parameters": parameters,
+        "pins": sum(brd.pin_count() for brd in synthetic),
+        "phases": results,
+    }
+
+def compare(baseline: dict, results: dict):
+    """
+    Tabulate the phases of two runs side by side
+    """
+    before = {p["name"]: p for p in baseline["phases"]}
+    lines = [f"{'phase':<16}{'before':>10}{'after':>10}{'ratio':>8}"]
+    for p in results["phases"]:
+        if p["name"] not in before:
+            continue
+        b = before[p["name"]]["seconds"]
+        lines.append(f"{p['name']:<16}{b:10.3f}{p['seconds']:10.3f}{p['seconds'] / b if b else 0:8.2f}")
+    return "\n".join(lines)
+
+def _commit():
+    try:
+        sha = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        return sha.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
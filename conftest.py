@@ -0,0 +1,21 @@
+
+import os
+
+import pytest
+
+def pytest_addoption(parser):
+    parser.addoption("--perf", action="store_true", default=False,
+                     help="also run the performance tests in tests/perf (or set EXPLORER_PERF=1)")
+    parser.addoption("--perf-update", action="store_true", default=False,
+                     help="run the performance tests and save the measured throughputs as the new baseline")
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: performance test, only run with --perf")
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--perf") or config.getoption("--perf-update") or os.environ.get("EXPLORER_PERF"):
+        return
+    skip = pytest.mark.skip(reason="performance test, use --perf to run it")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(skip)
@@ -1,8 +1,87 @@
 
-from .algorithms import *
-from .read_orcad import read_orcad
-from .read_eagle import read_eagle
-from .models import *
-from .read_rtl import read_rtl
-from .write_html import write_html, Connectivity
-from .write_json import write_json
+import importlib
+import sys
+import types
+
+# Public name -> the submodule defining it. A submodule is only imported when
+# one of its names is first used: a script that only reads io reports does not
+# pay for jinja2 or the orcad lexer.
+_names = {
+    'depth_first': 'algorithms',
+    'get_boards': 'algorithms',
+    'get_interfaces': 'algorithms',
+    'get_components': 'algorithms',
+    'get_wires': 'algorithms',
+    'get_pins': 'algorithms',
+
+    'read_orcad': 'read_orcad',
+
+    'read_eagle': 'read_eagle',
+    'read_eagle_xml': 'read_eagle',
+
+    'ComponentType': 'models',
+    'WireType': 'models',
+    'SymbolTable': 'models',
+    'System': 'models',
+    'Rtl': 'models',
+    'Signal': 'models',
+    'Board': 'models',
+    'Interface': 'models',
+    'PartDefinition': 'models',
+    'Component': 'models',
+    'Pin': 'models',
+    'Wire': 'models',
+    'Net': 'models',
+    'Netlist': 'models',
+    'connect_many': 'models',
+    'mate': 'models',
+    'this_is_an_fpga_and_theres_its_rtl': 'models',
+    'bind_rtls': 'models',
+    'Dump': 'models',
+
+    'read_rtl': 'read_rtl',
+    'read_rtls': 'read_rtl',
+
+    'write_html': 'write_html',
+    'Connectivity': 'write_html',
+
+    'write_json': 'write_json',
+
+    'snapshot': 'diff',
+    'diff': 'diff',
+    'Diff': 'diff',
+    'Change': 'diff',
+
+    'instrument': 'profiling',
+    'stats': 'profiling',
+}
+
+__all__ = list(_names)
+
+# The submodules that are not named after a function, as explorer.models,
+# are public too
+_submodules = set(_names.values()) - set(_names)
+
+def __getattr__(name):
+    if name in _submodules:
+        return importlib.import_module(f'.{name}', __name__)
+    if name not in _names:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f'.{_names[name]}', __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _submodules)
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a submodule binds it on the package. read_orcad, read_rtl,
+        # write_html... are named after the function they define, which must
+        # stay what explorer.read_orcad is
+        if isinstance(value, types.ModuleType) and _names.get(name) == name:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+sys.modules[__name__].__class__ = _Package
@@ -0,0 +1,222 @@
+
+from __future__ import annotations
+
+from explorer.models import System, Board, Netlist, Net
+from explorer.profiling import span, count
+
+def snapshot(obj: System | Board):
+    """
+
+    snapshot(obj)
+
+    Take a snapshot of a system, or of a board, to compare it with diff once
+    it has changed, or with another revision. A snapshot only holds names and
+    lists: it can be saved with json, and diffed in a later session.
+
+    Parameters
+    ----------
+    obj: System | Board - required
+        The system, or the board. The nets are only part of the snapshots of
+        systems, whose boards must each have an identifier of their own.
+
+    Returns
+    -------
+    snapshot: dict
+        Whether it is of a system or of a board. For each board, by
+        identifier: its components by refdes, with their
+        package, symbol, value, type and pins, by number, with their name and
+        wire. Its wires, by name, with their type. And the net of every wire
+        and signal, by key.
+    """
+    with span("snapshot"):
+        boards = obj.boards if isinstance(obj, System) else [obj]
+        result = {"of": "system" if isinstance(obj, System) else "board", "boards": {}, "nets": {}}
+        for board in boards:
+            if isinstance(obj, System) and not board.identifier: raise RuntimeError("board has no identifier")
+            if board.identifier in result["boards"]: raise RuntimeError(f"boards share identifier {board.identifier}")
+            components = {}
+            for component in board.components:
+                pins = {}
+                for number, pin in component._pins.items():
+                    wire = pin.wire
+                    pins[number] = [pin.name, None if wire is None else wire.name]
+                components[component.refdes] = [[component.package, component.symbol, component.value, int(component.type)], pins]
+            wires = {wire.name: int(wire.type) for wire in board.wires}
+            result["boards"][board.identifier] = {"components": components, "wires": wires}
+
+        if isinstance(obj, System):
+            netlist = Netlist(obj)
+            for net in netlist.nets.values():
+                for thing in net._things:
+                    result["nets"][Net.key_of(thing)] = net.key
+
+        return result
+
+class Change:
+    """
+    One difference between two snapshots: a board, component, pin, wire or
+    net that was added, removed or changed, or nets that were merged or
+    split. Path is where, eg 'mega.R1' or 'mega.R1.2' for a pin.
+    """
+    def __init__(self, kind: str, what: str, path: str, before=None, after=None) -> None:
+        self.kind = kind
+        self.what = what
+        self.path = path
+        self.before = before
+        self.after = after
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Change) and (self.kind, self.what, self.path, self.before, self.after) == \
+            (other.kind, other.what, other.path, other.before, other.after)
+
+    def __repr__(self) -> str:
+        if self.kind == "added":
+            return f"+ {self.what} {self.path}"
+        if self.kind == "removed":
+            return f"- {self.what} {self.path}"
+        if self.kind == "changed":
+            return f"~ {self.what} {self.path}: {self.before} -> {self.after}"
+        if self.kind == "merged":
+            return f"> {self.what} {self.path}: {', '.join(self.before)} merged"
+        return f"< {self.what} {self.path}: split into {', '.join(self.after)}"
+
+class Diff:
+    """
+    The changes between two snapshots, in the order of the boards, then of
+    the nets
+    """
+    def __init__(self) -> None:
+        self.changes: list[Change] = list()
+
+    def of(self, kind: str | None = None, what: str | None = None):
+        """
+        The changes of that kind (added, removed, changed, merged, split),
+        about that (board, component, pin, wire, net)
+        """
+        return [change for change in self.changes
+                if (kind is None or change.kind == kind) and (what is None or change.what == what)]
+
+    def __bool__(self) -> bool:
+        return len(self.changes) != 0
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def report(self):
+        """
+        Return the changes as plain text, one per line
+        """
+        return "".join(f"{change}\n" for change in self.changes)
+
+    def __repr__(self) -> str:
+        return f"Diff ({len(self.changes)} changes)"
+
+def diff(before: System | Board | dict, after: System | Board | dict):
+    """
+
+    diff(before, after)
+
+    Compare two systems, boards or snapshots. Boards are matched by
+    identifier, but two boards are compared whatever their identifiers.
+    Components are matched by refdes, pins by number and wires by name. Every
+    item is looked at once.
+
+    Parameters
+    ----------
+    before, after: System | Board | dict - required
+        What to compare: systems, boards, or snapshots taken earlier.
+
+    Returns
+    -------
+    diff: Diff
+        The boards, components, pins and wires added, removed or changed, and
+        the nets merged or split: a net of after holding wires and signals of
+        several nets of before, or the other way round.
+    ```
+    before = snapshot(system)
+    # ... read the new revision of the board
+    print(diff(before, system).report())
+    ```
+    """
+    with span("diff"):
+        before = before if isinstance(before, dict) else snapshot(before)
+        after = after if isinstance(after, dict) else snapshot(after)
+
+        result = Diff()
+        changes = result.changes
+
+        if before["of"] == after["of"] == "board":
+            (_, lhs), = before["boards"].items()
+            (identifier, rhs), = after["boards"].items()
+            _diff_board(changes, identifier, lhs, rhs)
+            count("diff.changes", len(changes))
+            return result
+
+        for identifier, lhs in before["boards"].items():
+            rhs = after["boards"].get(identifier)
+            if rhs is None:
+                changes.append(Change("removed", "board", identifier))
+                continue
+            _diff_board(changes, identifier, lhs, rhs)
+        for identifier in after["boards"]:
+            if identifier not in before["boards"]:
+                changes.append(Change("added", "board", identifier))
+
+        _diff_nets(changes, before["nets"], after["nets"])
+
+        count("diff.changes", len(changes))
+        return result
+
+def _diff_board(changes: list[Change], identifier: str, before: dict, after: dict):
+    for refdes, (lhs, lhs_pins) in before["components"].items():
+        path = f"{identifier}.{refdes}"
+        if refdes not in after["components"]:
+            changes.append(Change("removed", "component", path))
+            continue
+        rhs, rhs_pins = after["components"][refdes]
+        if lhs != rhs:
+            changes.append(Change("changed", "component", path, lhs, rhs))
+        if lhs_pins == rhs_pins:
+            continue
+        for number, pin in lhs_pins.items():
+            if number not in rhs_pins:
+                changes.append(Change("removed", "pin", f"{path}.{number}"))
+            elif pin != rhs_pins[number]:
+                changes.append(Change("changed", "pin", f"{path}.{number}", pin, rhs_pins[number]))
+        for number in rhs_pins:
+            if number not in lhs_pins:
+                changes.append(Change("added", "pin", f"{path}.{number}"))
+    for refdes in after["components"]:
+        if refdes not in before["components"]:
+            changes.append(Change("added", "component", f"{identifier}.{refdes}"))
+
+    for name, type in before["wires"].items():
+        if name not in after["wires"]:
+            changes.append(Change("removed", "wire", f"{identifier}.{name}"))
+        elif type != after["wires"][name]:
+            changes.append(Change("changed", "wire", f"{identifier}.{name}", type, after["wires"][name]))
+    for name in after["wires"]:
+        if name not in before["wires"]:
+            changes.append(Change("added", "wire", f"{identifier}.{name}"))
+
+def _diff_nets(changes: list[Change], before: dict[str, str], after: dict[str, str]):
+    # Only the wires and signals in both snapshots tell whether nets were
+    # merged or split. Nets are named after their key
+    merged: dict[str, set[str]] = dict()
+    split: dict[str, set[str]] = dict()
+    for thing, lhs in before.items():
+        rhs = after.get(thing)
+        if rhs is None:
+            continue
+        merged.setdefault(rhs, set()).add(lhs)
+        split.setdefault(lhs, set()).add(rhs)
+
+    for net, nets in merged.items():
+        if len(nets) > 1:
+            changes.append(Change("merged", "net", net, sorted(nets), None))
+    for net, nets in split.items():
+        if len(nets) > 1:
+            changes.append(Change("split", "net", net, None, sorted(nets)))
@@ -1,9 +1,12 @@
 
 from __future__ import annotations
+import sys
 from enum import IntEnum
+from typing import Callable, Iterable
 
 from contextlib import contextmanager
-from disjoint_set import DisjointSet
+
+from explorer.profiling import span, count
 
 class ComponentType(IntEnum):
     """
@@ -23,10 +26,46 @@ class WireType(IntEnum):
     DC = 1
     NC = 2
 
+class SymbolTable:
+    """
+    Pin numbers, pin names and wire names repeat a lot. Think of "1", "2" or
+    "GND" on thousands of components. The readers slice these strings out of
+    the reports, so each occurrence would otherwise be a brand new str.
+
+    A symbol table hands back the first str seen for a given value, so that
+    repeated strings share one object.
+    ```
+    symbols = SymbolTable()
+    a = symbols(''.join(['G', 'N', 'D']))
+    b = symbols(''.join(['G', 'N', 'D']))
+    a is b
+    ```
+    """
+    def __init__(self) -> None:
+        self._symbols: dict[str, str] = dict()
+
+    def __call__(self, symbol: str) -> str:
+        return self._symbols.setdefault(symbol, symbol)
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __repr__(self) -> str:
+        return f"SymbolTable ({len(self._symbols)} symbols)"
+
 class System:
-    """ system consists of one or more boards interconnected together."""
+    """
+    system consists of one or more boards interconnected together.
+
+    A system also owns a symbol table. Give it to the read_.* functions so that
+    boards of the same system share their pin numbers, pin names and wire names
+    ```
+    board = read_orcad('path/to/netlist', symbols=system.symbols)
+    ```
+    """
     def __init__(self, name = "Unnamed system") -> None:
         self.name = name
+        self.symbols = SymbolTable()
         self._boards: list[Board] = list()
         self._rtls: list[Rtl] = list()
 
@@ -83,6 +122,10 @@ class Rtl:
         self._signals: list[Signal]   = list()
         self._other: Interface | None = None
 
+        # Lookups by name and by pinloc. The first one added wins
+        self._signals_by_name: dict[str, Signal]   = dict()
+        self._signals_by_pinloc: dict[str, Signal] = dict()
+
     @property
     def parent(self):
         if self._parent is None: raise RuntimeError(f"rtl {self.name} malformed")
@@ -98,12 +141,16 @@ class Rtl:
         signal = Signal(name, pinloc)
         signal._parent = self
         self._signals.append(signal)
+        self._signals_by_name.setdefault(name, signal)
+        self._signals_by_pinloc.setdefault(pinloc, signal)
 
     def get_signal(self, name: str):
-        for signal in self._signals:
-            if signal.name == name:
-                return signal
-        raise RuntimeError(f"signal {name} not found")
+        if name not in self._signals_by_name: raise RuntimeError(f"signal {name} not found")
+        return self._signals_by_name[name]
+
+    def get_signal_by_pinloc(self, pinloc: str):
+        if pinloc not in self._signals_by_pinloc: raise RuntimeError(f"signal at {pinloc} not found")
+        return self._signals_by_pinloc[pinloc]
 
     @property
     def signals(self):
@@ -157,6 +204,20 @@ class Board:
     Name is rpi. identifier is rpi0, rpi1, rpi2 ...
     A board also has:
     - interfaces - these are connections to other interfaces on other boards
+
+    Identical boards need only be read once. The others are instances of it:
+    copies of its components, pins and wires, that share their part
+    definitions and names, and have their own identifier and interfaces.
+    Instances save the parsing, not the memory: each of them takes about as
+    much as the board it is copied from.
+    ```
+    rpi0 = read_orcad('path/to/rpi/netlist')
+    rpi0.identifier = 'rpi0'
+    rpi1 = rpi0.instantiate('rpi1')
+    rpi2 = rpi0.instantiate('rpi2')
+    ```
+    An instance is a copy of the board as it is when instantiated: changes
+    made to either of them afterwards are their own.
     """
     def __init__(self) -> None:
         self.name = ""
@@ -166,22 +227,57 @@ class Board:
         self._wires: list[Wire]           = list()
         self._interfaces: list[Interface] = list()
 
+        # Lookups by name. The first one added wins, as it would when
+        # searching the lists above
+        self._components_by_refdes: dict[str, Component] = dict()
+        self._wires_by_name: dict[str, Wire]              = dict()
+        self._interfaces_by_name: dict[str, Interface]    = dict()
+
     @property
     def parent(self):
         if self._parent is None: raise RuntimeError("board malformed")
         return self._parent
 
+    def instantiate(self, identifier: str):
+        """
+        Return a new board identical to this one, without its interfaces.
+        Components, pins and wires are copied, their part definitions and
+        names are shared
+        """
+        instance = Board()
+        instance.name = self.name
+        instance.identifier = identifier
+
+        pins: dict[Pin, Pin] = dict()
+        for component in self._components:
+            copy = Component(component.refdes, component.package, component.symbol, component.value, component.definition)
+            copy.type = component.type
+            copy.ignore_model = component.ignore_model
+            copy._model = list(component._model)
+            for number, pin in component._pins.items():
+                pins[pin] = copy._pins[number] = Pin(pin.number, pin.name, copy)
+            instance.add_component(copy)
+
+        for wire in self._wires:
+            copy = Wire(wire.name)
+            copy.type = wire.type
+            instance.add_wire(copy)
+            copy._pins = [pins[pin] for pin in wire._pins]
+            for pin in copy._pins:
+                pin._wire = copy
+
+        return instance
+
     def add_component(self, component: Component):
         if component._parent is self: raise RuntimeError(f"component {component.refdes} is already part of board")
         if component._parent is not None: raise RuntimeError(f"component {component.refdes} is already part of another board")
         component._parent = self
         self._components.append(component)
+        self._components_by_refdes.setdefault(component.refdes, component)
 
     def get_component(self, name: str):
-        for component in self._components:
-            if component.refdes == name:
-                return component
-        raise RuntimeError(f"component {name} not found")
+        if name not in self._components_by_refdes: raise RuntimeError(f"component {name} not found")
+        return self._components_by_refdes[name]
 
     @property
     def components(self):
@@ -192,12 +288,11 @@ class Board:
         if wire._parent is not None: raise RuntimeError(f"wire {wire.name} is already part of another board")
         wire._parent = self
         self._wires.append(wire)
+        self._wires_by_name.setdefault(wire.name, wire)
 
     def get_wire(self, name: str):
-        for wire in self._wires:
-            if wire.name == name:
-                return wire
-        raise RuntimeError(f"wire {name} not found")
+        if name not in self._wires_by_name: raise RuntimeError(f"wire {name} not found")
+        return self._wires_by_name[name]
 
     @property
     def wires(self):
@@ -208,12 +303,11 @@ class Board:
         if interface._parent is not None: raise RuntimeError(f"interface {interface.name} is already part of another board")
         interface._parent = self
         self._interfaces.append(interface)
+        self._interfaces_by_name.setdefault(interface.name, interface)
 
     def get_interface(self, name: str):
-        for interface in self._interfaces:
-            if interface.name == name:
-                return interface
-        raise RuntimeError(f"interface {name} not found")
+        if name not in self._interfaces_by_name: raise RuntimeError(f"interface {name} not found")
+        return self._interfaces_by_name[name]
 
     @property
     def interfaces(self):
@@ -254,6 +348,8 @@ class Interface:
         self._parent: Board | None    = None
         self._other: Interface | Rtl | None = None
         self._pins: list[Pin]         = list()
+        # The index of each pin in _pins
+        self._indexes: dict[Pin, int] = dict()
 
     @property
     def name(self):
@@ -270,17 +366,65 @@ class Interface:
 
     def add_pin(self, pin: Pin):
         if pin.parent is None: raise RuntimeError("pin does not belong to a valid component")
-        if pin.parent.parent is None or pin.parent.parent is not self.parent: raise RuntimeError("component and interface are on different board")
-        if self in pin.interfaces: raise RuntimeError("pin already belongs to this interface")
+        board = self.parent
+        if pin.parent._parent is None or pin.parent._parent is not board: raise RuntimeError("component and interface are on different board")
+        if pin in self._indexes: raise RuntimeError("pin already belongs to this interface")
         if self.other is not None: raise RuntimeError("cannot add pin to already connected interface")
 
+        self._indexes[pin] = len(self._pins)
         self._pins.append(pin)
-        pin._interfaces.append(self)
+        pin._add_interface(self)
+
+    def add_pins(self, pins: Iterable[Pin]):
+        """
+        Add many pins at once, in order. Same as add_pin for each of them, but
+        the board is looked up and validated once. Nothing is added when one
+        of the pins cannot be
+        """
+        pins = list(pins)
+        if self.other is not None: raise RuntimeError("cannot add pin to already connected interface")
+        self._extend(pins, _indexes_of(self.parent, pins, self._indexes))
+
+    def _extend(self, pins: list[Pin], indexes: dict[Pin, int]):
+        self._indexes = indexes
+        self._pins.extend(pins)
+        for pin in pins:
+            pin._add_interface(self)
+
+    @classmethod
+    def from_components(cls, name: str, components: Iterable[Component | str], board: Board | None = None):
+        """
+        Return a new interface of the pins of the components, component after
+        component, added to the board. Components are given as such, or by
+        refdes on the board. The board defaults to the one of the first
+        component. Nothing is added to the board when one of the components
+        or pins cannot be
+        """
+        components = list(components)
+        if board is None:
+            if len(components) == 0 or isinstance(components[0], str): raise RuntimeError(f"interface {name} has no board")
+            board = components[0].parent
+        components = [board.get_component(component) if isinstance(component, str) else component for component in components]
+        pins = [pin for component in components for pin in component._pins.values()]
+        indexes = _indexes_of(board, pins, dict())
+
+        interface = cls(name)
+        board.add_interface(interface)
+        interface._extend(pins, indexes)
+        return interface
 
     @property
     def pins(self):
         return self._pins
 
+    def index_of(self, pin: Pin):
+        """
+        The index of the pin in this interface, that of the signal or pin of
+        the other interface it is connected to
+        """
+        if pin not in self._indexes: raise RuntimeError(f"pin {pin.name} not part of interface {self.name}")
+        return self._indexes[pin]
+
     def connect(self, other: Interface | Rtl):
         if self.parent is None: raise RuntimeError("interface malformed")
         if other.parent is None: raise RuntimeError("interface malformed")
@@ -302,24 +446,55 @@ class Interface:
     def __str__(self) -> str:
         return f"Interface {hex(id(self))}"
 
+class PartDefinition:
+    """
+    What all the components of a same part have in common: a package, a
+    symbol, a value, a type and the (number, name) of their pins.
+
+    Thousands of identical resistors, or copies of the same fpga, then share a
+    single definition. Readers make one per part of the library.
+    ```
+    r0402 = PartDefinition('0402', 'RES', '10k', pins=[('1', '1'), ('2', '2')])
+    r1 = Component.from_definition('R1', r0402)
+    r2 = Component.from_definition('R2', r0402)
+    ```
+    """
+    def __init__(self, package: str, symbol: str, value: str,
+                 type: ComponentType = ComponentType.Default, pins: tuple[tuple[str, str], ...] = ()) -> None:
+        self.package = package
+        self.symbol  = symbol
+        self.value   = value
+        self.type    = type
+        self.pins: tuple[tuple[str, str], ...] = tuple(pins)
+
+    def __repr__(self) -> str:
+        return f"PartDefinition {self.symbol} {self.package} {self.value} ({len(self.pins)} pins)"
+
 class Component:
     """
     A component is found on a board.
     
     Component is either a discrete (resistor, cap ...), a chip or a connector.
     It has a refdes, a value, corresponds to both a schematic symbol and a pcb
-    package
+    package. These come from its part definition, shared with the other
+    components of the same part.
     """
-    def __init__(self, refdes: str, package: str, symbol: str, value: str) -> None:
-        self._refdes  = refdes
-        self._package = package
-        self._symbol  = symbol
-        self._value   = value
-        self.type     = ComponentType.Default
+    def __init__(self, refdes: str, package: str, symbol: str, value: str,
+                 definition: PartDefinition | None = None) -> None:
+        if definition is None:
+            definition = PartDefinition(package, symbol, value)
+        elif (package, symbol, value) != (definition.package, definition.symbol, definition.value):
+            raise RuntimeError(f"component {refdes} does not match its part definition")
+
+        self._refdes     = refdes
+        self._definition = definition
+        self.type        = definition.type
 
         self._parent: Board | None = None
         self._pins: dict[str,Pin]  = dict()
-
+        # The pins by name. Built the first time a pin is looked up by name,
+        # most components never are
+        self._pins_by_name: dict[str, list[Pin]] | None = None
 
         # A model is a list of pins that are actually connected when looked
         # from a system level pov.
@@ -332,21 +507,35 @@ class Component:
         # If true, we will not apply the component model during mapping
         self.ignore_model = False
 
+    @classmethod
+    def from_definition(cls, refdes: str, definition: PartDefinition):
+        """
+        Return a new component of that part, with its pins
+        """
+        component = cls(refdes, definition.package, definition.symbol, definition.value, definition)
+        for number, name in definition.pins:
+            component.add_pin(Pin(number, name, component))
+        return component
+
     @property
     def refdes(self):
         return self._refdes
 
+    @property
+    def definition(self):
+        return self._definition
+
     @property
     def package(self):
-        return self._package
+        return self._definition.package
 
     @property
     def symbol(self):
-        return self._symbol
+        return self._definition.symbol
 
     @property
     def value(self):
-        return self._value
+        return self._definition.value
 
     @property
     def parent(self):
@@ -367,11 +556,28 @@ class Component:
     def add_pin(self, pin: Pin):
         if pin.number in self._pins: raise RuntimeError("redefinition of pin")
         self._pins[pin.number] = pin
+        if self._pins_by_name is not None:
+            self._pins_by_name.setdefault(pin.name, []).append(pin)
 
     def get_pin(self, number: str):
         if number not in self._pins: raise RuntimeError(f"pin {number} not found")
         return self._pins[number]
 
+    def get_pins_by_name(self, name: str):
+        """
+        The pins of that name, eg all the GND pins. Empty if there are none
+        """
+        if self._pins_by_name is None:
+            self._pins_by_name = dict()
+            for pin in self._pins.values():
+                self._pins_by_name.setdefault(pin.name, []).append(pin)
+        return self._pins_by_name.get(name, [])
+
+    def get_pin_by_name(self, name: str):
+        pins = self.get_pins_by_name(name)
+        if len(pins) == 0: raise RuntimeError(f"pin {name} not found")
+        return pins[0]
+
     def __repr__(self) -> str:
         return f"Component {self.refdes} ({len(self._pins)} pins)"
 
@@ -386,7 +592,11 @@ class Pin:
     Same for interfaces. Each interface consists of several outerpins.
 
     A pin of a component can be part of multiple interfaces.
+
+    Boards have a lot of pins, so pins are kept small: they have no __dict__.
     """
+    __slots__ = ('_number', '_name', '_parent', '_interfaces', '_wire')
+
     def __init__(self, number: str, name: str, parent: Component) -> None:
         self._number = number
         self._name = name
@@ -395,6 +605,9 @@ class Pin:
 
         self._wire: Wire | None = None
 
+    def _add_interface(self, interface: Interface):
+        self._interfaces.append(interface)
+
     @property
     def number(self):
         return self._number
@@ -460,12 +673,30 @@ class Wire:
 
 
 class Net:
-    def __init__(self, net_number: int, things: set[Wire | Signal]):
+    """
+    The wires and signals connected together across the system.
+
+    The key of a net is the smallest of its wires and signals names, prefixed
+    with their board identifier or rtl name: it is the same from a run to the
+    next, as long as the net keeps that wire or signal. Nets whose smallest
+    names are the same, as boards with no identifier or duplicate wire names
+    make them, are told apart by a ~2, ~3... suffix. It names the net in the
+    html pages, where net_number, its rank, would change whenever a net is
+    added.
+    """
+    def __init__(self, net_number: int, things: set[Wire | Signal], key: str = ""):
         self.net_number = net_number
+        self.key = key
         self._things = things
 
+    @staticmethod
+    def key_of(thing: Wire | Signal):
+        if isinstance(thing, Wire):
+            return f"{thing.parent.identifier}.{thing.name}"
+        return f"{thing.parent.name}.{thing.name}"
+
     def __repr__(self) -> str:
-        return f"Net #{self.net_number} ({len(self._things)} wires and signals)"
+        return f"Net #{self.net_number} {self.key} ({len(self._things)} wires and signals)"
 
 class Netlist:
     """
@@ -493,101 +724,415 @@ class Netlist:
     n1 == n2 != n3
     ```
     """
+    @span("netlist")
     def __init__(self, system: System):
-        set_of_wires_and_signals = DisjointSet()
+        """
+        Wires are numbered, board after board. The wires each board shorts
+        together through its component models are worked out first, a board
+        at a time, as arrays of integers. Boards are then merged together
+        across their interfaces and rtls.
+        """
         self.nets: dict[Wire | Signal, Net] = dict()
 
+        things: list[Wire | Signal] = list()
+        index: dict[Wire | Signal, int] = dict()
+        offsets: list[int] = list()
         for board in system.boards:
+            offsets.append(len(things))
             for wire in board.wires:
-                set_of_wires_and_signals.find(wire)
-            for interface in board.interfaces:
-                if interface.other is None:
-                    continue
-                if isinstance(interface.other, Rtl):
-                    for i in range(len(interface.pins)):
-                        lhs = interface.pins[i].wire
-                        rhs = interface.other._signals[i]
-                        if lhs is None or rhs is None:
-                            continue
-                        set_of_wires_and_signals.union(lhs, rhs)
-                if isinstance(interface.other, Interface):
-                    for i in range(len(interface.pins)):
-                        lhs = interface.pins[i].wire
-                        rhs = interface.other.pins[i].wire
-                        if lhs is None or rhs is None:
-                            continue
-                        # Note wire NC is a special wire. Any pins connected to
-                        # the NC wire are 'No connect', ie are open. So,dont even
-                        # try to merge NC wires with other wires if any
-                        if (lhs.type == WireType.NC) ^ (rhs.type == WireType.NC):
-                            continue
-                        set_of_wires_and_signals.union(lhs, rhs)
-            for component in board.components:
-                if component.ignore_model:
-                    continue
-                for shorts in component.model:
-                    lhs = component.get_pin(shorts[0]).wire
-                    rhs = component.get_pin(shorts[1]).wire
-                    if lhs is None or rhs is None:
-                        continue
-                    if (lhs.type == WireType.NC) ^ (rhs.type == WireType.NC):
+                index[wire] = len(things)
+                things.append(wire)
+
+        with span("netlist.local"):
+            labels: dict[Board, list[int]] = dict()
+            for board in system.boards:
+                shorts = _shorts(board)
+                labels[board] = _labels(len(board.wires), shorts)
+                # Each union finds both its wires, and every wire is found
+                # once labelled
+                count("netlist.unions", len(shorts))
+                count("netlist.finds", 2 * len(shorts) + len(board.wires))
+
+        parent = [offset + label for board, offset in zip(system.boards, offsets)
+                  for label in labels[board]]
+
+        def find(i: int):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(lhs: Wire | Signal, rhs: Wire | Signal):
+            for thing in (lhs, rhs):
+                if thing not in index:
+                    index[thing] = len(things)
+                    things.append(thing)
+                    parent.append(index[thing])
+            lhs, rhs = find(index[lhs]), find(index[rhs])
+            if lhs != rhs:
+                parent[max(lhs, rhs)] = min(lhs, rhs)
+
+        with span("netlist.merge"):
+            unions = 0
+            for board in system.boards:
+                for interface in board.interfaces:
+                    if interface.other is None:
                         continue
-                    if lhs.type == WireType.DC or rhs.type == WireType.DC:
-                        continue
-                    set_of_wires_and_signals.union(lhs, rhs)
-
-        net_number = 0
-        for key, ws in set_of_wires_and_signals.itersets(with_canonical_elements=True):
-            self.nets[key] = Net(net_number, ws)
-            net_number += 1
-        self.set_of_wires_and_signals = set_of_wires_and_signals
+                    if isinstance(interface.other, Rtl):
+                        for i in range(len(interface.pins)):
+                            lhs = interface.pins[i].wire
+                            rhs = interface.other._signals[i]
+                            if lhs is None or rhs is None:
+                                continue
+                            union(lhs, rhs)
+                            unions += 1
+                    if isinstance(interface.other, Interface):
+                        for i in range(len(interface.pins)):
+                            lhs = interface.pins[i].wire
+                            rhs = interface.other.pins[i].wire
+                            if lhs is None or rhs is None:
+                                continue
+                            # Note wire NC is a special wire. Any pins connected to
+                            # the NC wire are 'No connect', ie are open. So,dont even
+                            # try to merge NC wires with other wires if any
+                            if (lhs.type == WireType.NC) ^ (rhs.type == WireType.NC):
+                                continue
+                            union(lhs, rhs)
+                            unions += 1
+            count("netlist.unions", unions)
+            count("netlist.finds", 2 * unions)
+
+        sets: dict[int, list[int]] = dict()
+        for i in range(len(things)):
+            sets.setdefault(find(i), list()).append(i)
+        count("netlist.finds", len(things))
+
+        # Every wire and signal maps to its net directly, for the templates
+        # query the net of each of them
+        self._nets_by_thing: dict[Wire | Signal, Net] = dict()
+        # Nets are numbered in the order of their smallest wire or signal, for
+        # the numbers to not depend on the order the wires were merged in.
+        # Wires and signals of a same key are told apart by their kind, then
+        # their position in the system, so that no two nets tie
+        def order(i: int):
+            thing = things[i]
+            return (Net.key_of(thing), 0 if isinstance(thing, Wire) else 1, i)
+
+        keyed = sorted((min(map(order, members)), members) for members in sets.values())
+        keys: set[str] = set()
+        for net_number, ((name, _, first), members) in enumerate(keyed):
+            # Keys are the anchors of the nets in the html pages: the nets
+            # that would share one get a suffix, in order
+            key, n = name, 1
+            while key in keys:
+                n += 1
+                key = f"{name}~{n}"
+            keys.add(key)
+            ws = {things[i] for i in members}
+            net = self.nets[things[first]] = Net(net_number, ws, key)
+            for thing in ws:
+                self._nets_by_thing[thing] = net
+        count("netlist.nets", len(keyed))
 
     def get_net_corresponding_to_wire_or_signal(self, thing: Wire | Signal):
         """
         Given a wire or a signal (which is part of the system provided while
         constructing this class), get its corresponding net
         """
-        if thing not in self.nets:
-            thing = self.set_of_wires_and_signals.find(thing)
-        if thing not in self.nets:
+        net = self._nets_by_thing.get(thing)
+        if net is None:
             raise ValueError("Wire not part of netlist")
-        return self.nets[thing]
+        return net
 
-def this_is_an_fpga_and_theres_its_rtl(fpga: Component, rtl: Rtl):
+def _shorts(board: Board):
     """
-    this_is_an_fpga_and_theres_its_rtl(fpga, rtl)
+    The (lhs, rhs) indexes in board.wires of the wires the component models
+    of the board short together
+    """
+    index = {wire: i for i, wire in enumerate(board.wires)}
+    shorts = []
+    for component in board.components:
+        if component.ignore_model:
+            continue
+        for short in component.model:
+            lhs = component.get_pin(short[0])._wire
+            rhs = component.get_pin(short[1])._wire
+            if lhs is None or rhs is None:
+                continue
+            if (lhs.type == WireType.NC) ^ (rhs.type == WireType.NC):
+                continue
+            if lhs.type == WireType.DC or rhs.type == WireType.DC:
+                continue
+            shorts.append((index[lhs], index[rhs]))
+    return shorts
+
+def _labels(wires: int, shorts: list[tuple[int, int]]):
+    """
+    The smallest index of the wires each of the wires of a board is shorted
+    to
+    """
+    parent = list(range(wires))
 
-    Helper function that links RTL to its Component.
+    def find(i: int):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for lhs, rhs in shorts:
+        lhs, rhs = find(lhs), find(rhs)
+        if lhs != rhs:
+            parent[max(lhs, rhs)] = min(lhs, rhs)
+    return [find(i) for i in range(wires)]
+
+def _indexes_of(board: Board, pins: list[Pin], indexes: dict[Pin, int]):
+    """
+    Check the pins can be added to an interface of the board, after those
+    already indexed, and return the indexes of all of them
     """
+    indexes = dict(indexes)
+    for pin in pins:
+        if pin.parent is None: raise RuntimeError("pin does not belong to a valid component")
+        if pin.parent._parent is not board: raise RuntimeError("component and interface are on different board")
+        if pin in indexes: raise RuntimeError(f"pin {pin.name} already belongs to this interface")
+        indexes[pin] = len(indexes)
+    return indexes
 
-    interface = Interface(f"{fpga.refdes}_{rtl.name}")
+def connect_many(pairs: Iterable[tuple[Interface, Interface | Rtl]]):
+    """
+    connect_many(pairs)
 
-    fpga.parent.parent.add_rtl(rtl)
-    fpga.parent.add_interface(interface)
+    Connect many (interface, other) pairs at once, as Interface.connect would
+    one by one. Every pair is validated first: nothing is connected when one
+    of them cannot be.
+    ```
+    connect_many([(rpi0_header, hat0_header), (rpi1_header, hat1_header)])
+    ```
+    """
+    pairs = list(pairs)
+    seen: set[int] = set()
+    for lhs, rhs in pairs:
+        if lhs.parent is None or rhs.parent is None: raise RuntimeError("interface malformed")
+        for interface in (lhs, rhs):
+            if interface._other is not None or id(interface) in seen: raise RuntimeError(f"interface {interface.name} is already connected")
+            seen.add(id(interface))
+        other_number = len(rhs._pins) if isinstance(rhs, Interface) else len(rhs._signals)
+        if len(lhs._pins) != other_number: raise RuntimeError("interface do not match")
+
+    for lhs, rhs in pairs:
+        lhs._other = rhs
+        rhs._other = lhs
+
+def mate(lhs: Component | str, rhs: Component | str,
+         pinmap: str | dict[str, str] | Callable[[str], str | None] = "same",
+         names: tuple[str, str] | None = None,
+         lhs_board: Board | None = None, rhs_board: Board | None = None):
+    """
+    mate(lhs, rhs, pinmap="same", ...)
+
+    Mate two connectors: build an interface of the pins of each of them, and
+    connect the two.
+
+    Parameters
+    ----------
+    lhs, rhs: Component | str - required
+        The connectors, or their refdes on lhs_board and rhs_board.
+    pinmap: str | dict | callable, named, default: "same"
+        Which pin of rhs each pin of lhs mates with, by pin number:
+        - "same": the pin of the same number. Pins rhs does not have are left
+          out.
+        - "mirrored": for connectors numbered 1 to n facing each other, pin k
+          mates with pin n + 1 - k. Every pin must be numbered.
+        - a dict of lhs pin number -> rhs pin number. Pins not in the dict are
+          left out.
+        - a function of the lhs pin number, returning the rhs pin number, or
+          None to leave the pin out.
+    names: tuple[str, str], named, default: None
+        The names of the lhs and rhs interfaces. Defaults to the refdes of
+        their connector.
+    lhs_board, rhs_board: Board, named, default: None
+        The boards of the connectors. Default to the boards the connectors are
+        on, and must be those when the connectors are given as components.
+
+    Returns
+    -------
+    interfaces: tuple[Interface, Interface]
+        The lhs and rhs interfaces, connected.
+    ```
+    mate(rpi.get_component("J8"), hat.get_component("J1"), "same")
+    ```
+    """
+    lhs_board, rhs_board = _board_of(lhs, lhs_board), _board_of(rhs, rhs_board)
+    lhs = lhs_board.get_component(lhs) if isinstance(lhs, str) else lhs
+    rhs = rhs_board.get_component(rhs) if isinstance(rhs, str) else rhs
+
+    if pinmap == "same":
+        pinmap = lambda number: number if number in rhs._pins else None
+    elif pinmap == "mirrored":
+        pins = len(lhs._pins)
+        if len(rhs._pins) != pins: raise RuntimeError(f"connectors {lhs.refdes} and {rhs.refdes} do not have as many pins")
+        numbers = [number for number in list(lhs._pins) + list(rhs._pins) if not number.isdigit()]
+        if numbers: raise RuntimeError(f"connectors {lhs.refdes} and {rhs.refdes} cannot be mirrored, pins {', '.join(numbers)} are not numbered")
+        pinmap = lambda number: str(pins + 1 - int(number))
+    elif isinstance(pinmap, dict):
+        pinmap = pinmap.get
+    elif isinstance(pinmap, str):
+        raise RuntimeError(f"unknown pin map {pinmap}")
+
+    lhs_pins, rhs_pins, missing = [], [], []
+    for number, pin in lhs._pins.items():
+        other = pinmap(number)
+        if other is None:
+            continue
+        if other not in rhs._pins:
+            missing.append(f"{number}->{other}")
+            continue
+        lhs_pins.append(pin)
+        rhs_pins.append(rhs._pins[other])
+    if missing: raise RuntimeError(f"connector {rhs.refdes} has no pin for {lhs.refdes} pins {', '.join(missing)}")
+    if len(set(rhs_pins)) != len(rhs_pins): raise RuntimeError(f"pins of connector {rhs.refdes} mated more than once")
+    lhs_indexes = _indexes_of(lhs_board, lhs_pins, dict())
+    rhs_indexes = _indexes_of(rhs_board, rhs_pins, dict())
+
+    lhs_name, rhs_name = (lhs.refdes, rhs.refdes) if names is None else names
+    interfaces = []
+    for name, board, pins, indexes in ((lhs_name, lhs_board, lhs_pins, lhs_indexes), (rhs_name, rhs_board, rhs_pins, rhs_indexes)):
+        interface = Interface(name)
+        board.add_interface(interface)
+        interface._extend(pins, indexes)
+        interfaces.append(interface)
+
+    interfaces[0].connect(interfaces[1])
+    return interfaces[0], interfaces[1]
+
+def _board_of(component: Component | str, board: Board | None):
+    """
+    The board of a component given as such, or by refdes on the board
+    """
+    if board is None:
+        if isinstance(component, str): raise RuntimeError(f"component {component} given by refdes without a board")
+        if component._parent is None: raise RuntimeError(f"component {component.refdes} is not on a board")
+        return component._parent
+    if not isinstance(component, str) and component._parent is not board: raise RuntimeError(f"component {component.refdes} is not on board {board.identifier}")
+    return board
 
-    # Sort rtl signal by name
-    rtl._signals.sort(key=lambda x: x.name)
+def this_is_an_fpga_and_theres_its_rtl(fpga: Component, rtl: Rtl):
+    """
+    this_is_an_fpga_and_theres_its_rtl(fpga, rtl)
 
-    for sig in rtl._signals:
-        pin = fpga.get_pin(sig.pinloc)
-        interface.add_pin(pin)
+    Helper function that links RTL to its Component.
+    """
+    bind_rtls([(fpga, rtl)])
 
-    interface.connect(rtl)
+def bind_rtls(pairs: Iterable[tuple[Component | str, Rtl]], board: Board | None = None):
+    """
+    bind_rtls(pairs, board=None)
+
+    Link many rtls to their fpga at once, as this_is_an_fpga_and_theres_its_rtl
+    would one by one: each rtl is added to the system, and connected to a new
+    interface of its fpga pins, named after the fpga and the rtl.
+
+    Every pair is checked first: the fpga is on a board of a system, the rtl
+    is not already part of one, and every signal has a pin of its own on its
+    fpga. Every signal without a pin is reported at once, and nothing is
+    linked when a pair cannot be.
+
+    Parameters
+    ----------
+    pairs: Iterable[tuple[Component | str, Rtl]] - required
+        The fpgas, or their refdes on the board, and their rtl.
+    board: Board, named, default: None
+        The board of the fpgas. Defaults to the board each fpga is on, and
+        must be that one when the fpgas are given as components.
+    ```
+    bind_rtls([("U1", rtl1), ("U2", rtl2)], board=board)
+    ```
+    """
+    bindings = []
+    missing = []
+    seen: set[int] = set()
+    for fpga, rtl in pairs:
+        fpga_board = _board_of(fpga, board)
+        fpga = fpga_board.get_component(fpga) if isinstance(fpga, str) else fpga
+        if fpga_board._parent is None: raise RuntimeError(f"board {fpga_board.identifier} is not part of a system")
+        if rtl._parent is not None or id(rtl) in seen: raise RuntimeError(f"rtl {rtl.name} is already part of a system")
+        seen.add(id(rtl))
+
+        # Sort rtl signal by name
+        signals = sorted(rtl._signals, key=lambda x: x.name)
+
+        pins = []
+        for sig in signals:
+            pin = fpga._pins.get(sig.pinloc)
+            if pin is None:
+                missing.append(f"{fpga.refdes}.{sig.pinloc} ({rtl.name}.{sig.name})")
+            pins.append(pin)
+        bindings.append((fpga_board, fpga, rtl, signals, pins))
+    if missing: raise RuntimeError(f"pins not found: {', '.join(missing)}")
+
+    checked = []
+    for fpga_board, fpga, rtl, signals, pins in bindings:
+        used: set[Pin] = set()
+        shared = []
+        for sig, pin in zip(signals, pins):
+            if pin in used:
+                shared.append(sig.pinloc)
+            used.add(pin)
+        if shared: raise RuntimeError(f"signals of rtl {rtl.name} share pins {', '.join(shared)} of {fpga.refdes}")
+        checked.append((fpga_board, fpga, rtl, signals, pins, _indexes_of(fpga_board, pins, dict())))
+
+    for fpga_board, fpga, rtl, signals, pins, indexes in checked:
+        rtl._signals = signals
+        interface = Interface(f"{fpga.refdes}_{rtl.name}")
+        fpga_board._parent.add_rtl(rtl)
+        fpga_board.add_interface(interface)
+        interface._extend(pins, indexes)
+        interface.connect(rtl)
 
 class Dump:
-    def __init__(self, obj, file = None, offset = 4) -> None:
+    """
+    Dump(obj, file=None, ...)
+
+    Write a yaml like dump of a system, board, rtl... and of everything in it,
+    to the file, or to stdout. Lines are written as the models are walked, and
+    never all held in memory at once.
+
+    Parameters
+    ----------
+    boards: Iterable[str], named, default: None
+        When given, only dump the boards of these identifiers, and the rtls
+        bound to them. Only for systems.
+    component_types: Iterable[ComponentType], named, default: None
+        When given, only dump the components of these types.
+    ```
+    Dump(system, 'out/system.txt', component_types=[ComponentType.Connector])
+    ```
+    """
+    def __init__(self, obj, file = None, offset = 4,
+                 boards: Iterable[str] | None = None,
+                 component_types: Iterable[ComponentType] | None = None) -> None:
 
         self.current_state = []
 
         self.current_state.append((0, False))
         self.offset = offset
+        if boards is not None and not isinstance(obj, System): raise RuntimeError("boards can only be filtered in a system")
+        self.boards = None if boards is None else set(boards)
+        self.component_types = None if component_types is None else set(component_types)
 
-        result = self.dump(obj)
         if file is None:
-            print('\n'.join(result))
+            self.write(obj, sys.stdout)
+            sys.stdout.write('\n')
             return
         with open(file, "w") as f:
-            f.write('\n'.join(result))
+            self.write(obj, f)
+
+    def write(self, obj, f):
+        separator = ''
+        for line in self.dump(obj):
+            f.write(separator)
+            f.write(line)
+            separator = '\n'
 
     def indentation(self):
         return ' ' * self.current_state[-1][0]
@@ -606,148 +1151,135 @@ class Dump:
 
     def dump(self, obj):
         fcall = f'dump_{obj.__class__.__name__.lower()}'
-        return getattr(self, fcall, lambda x: [f"{self.title()}Unsupported feature {fcall}"])(obj)
+        return getattr(self, fcall, lambda x: iter([f"{self.title()}Unsupported feature {fcall}"]))(obj)
 
     def dump_system(self, inst: System):
-        result = []
-        result += [f"{self.title()}System {hex(id(inst))} name: '{inst.name}'"]
+        yield f"{self.title()}System {hex(id(inst))} name: '{inst.name}'"
+
+        boards = inst._boards
+        if self.boards is not None:
+            boards = [brd for brd in boards if brd.identifier in self.boards]
 
-        if len(inst._boards) == 0:
-            result += [f"{self.indentation()}boards: []"]
+        if len(boards) == 0:
+            yield f"{self.indentation()}boards: []"
         else:
-            result += [f"{self.indentation()}boards:"]
-        for brd in inst._boards:
+            yield f"{self.indentation()}boards:"
+        for brd in boards:
             with self.indent(True):
-                result += self.dump(brd)
+                yield from self.dump(brd)
 
-        if len(inst._rtls) == 0:
-            result += [f"{self.indentation()}rtls: []"]
+        rtls = inst._rtls
+        if self.boards is not None:
+            rtls = [rtl for rtl in rtls if rtl._other is not None and rtl._other.parent.identifier in self.boards]
+
+        if len(rtls) == 0:
+            yield f"{self.indentation()}rtls: []"
         else:
-            result += [f"{self.indentation()}rtls:"]
-        for rtl in inst._rtls:
+            yield f"{self.indentation()}rtls:"
+        for rtl in rtls:
             with self.indent(True):
-                result += self.dump(rtl)
-
-        return result
+                yield from self.dump(rtl)
 
     def dump_rtl(self, inst):
-        result = []
-        result += [f"{self.title()}Rtl {hex(id(inst))} name: '{inst.name}'"]
-        result += [f"{self.indentation()}parent&: {inst._parent}"]
-        result += [f"{self.indentation()}other&: {inst._other}"]
+        yield f"{self.title()}Rtl {hex(id(inst))} name: '{inst.name}'"
+        yield f"{self.indentation()}parent&: {inst._parent}"
+        yield f"{self.indentation()}other&: {inst._other}"
 
         if len(inst._signals) == 0:
-            result += [f"{self.indentation()}signals: []"]
+            yield f"{self.indentation()}signals: []"
         else:
-            result += [f"{self.indentation()}signals:"]
+            yield f"{self.indentation()}signals:"
         for signal in inst._signals:
             with self.indent(True):
-                result += self.dump(signal)
-
-        return result
+                yield from self.dump(signal)
 
     def dump_signal(self, inst):
-        result = []
-        result += [f"{self.title()}Signal {hex(id(inst))} name: '{inst.name}' pinloc: '{inst.pinloc}'"]
-        result += [f"{self.indentation()}parent&: {inst._parent}"]
-        return result
+        yield f"{self.title()}Signal {hex(id(inst))} name: '{inst.name}' pinloc: '{inst.pinloc}'"
+        yield f"{self.indentation()}parent&: {inst._parent}"
 
     def dump_board(self, inst: Board):
-        result = []
-        result += [f"{self.title()}Board {hex(id(inst))} name: '{inst.name}' identifier: '{inst.identifier}'"]
-        result += [f"{self.indentation()}parent&: {inst.parent}"]
+        yield f"{self.title()}Board {hex(id(inst))} name: '{inst.name}' identifier: '{inst.identifier}'"
+        yield f"{self.indentation()}parent&: {inst.parent}"
+
+        components = inst._components
+        if self.component_types is not None:
+            components = [component for component in components if component.type in self.component_types]
 
-        if len(inst._components) == 0:
-            result += [f"{self.indentation()}components: []"]
+        if len(components) == 0:
+            yield f"{self.indentation()}components: []"
         else:
-            result += [f"{self.indentation()}components:"]
-        for component in inst._components:
+            yield f"{self.indentation()}components:"
+        for component in components:
             with self.indent(True):
-                result += self.dump(component)
+                yield from self.dump(component)
 
         if len(inst._wires) == 0:
-            result += [f"{self.indentation()}wires: []"]
+            yield f"{self.indentation()}wires: []"
         else:
-            result += [f"{self.indentation()}wires:"]
+            yield f"{self.indentation()}wires:"
         for wire in inst._wires:
             with self.indent(True):
-                result += self.dump(wire)
+                yield from self.dump(wire)
 
         if len(inst._interfaces) == 0:
-            result += [f"{self.indentation()}interfaces: []"]
+            yield f"{self.indentation()}interfaces: []"
         else:
-            result += [f"{self.indentation()}interfaces:"]
+            yield f"{self.indentation()}interfaces:"
         for interface in inst._interfaces:
             with self.indent(True):
-                result += self.dump(interface)
-
-        return result
+                yield from self.dump(interface)
 
     def dump_interface(self, inst: Interface):
-        result = []
-        result += [f"{self.title()}Interface {hex(id(inst))} name: '{inst.name}'"]
-        result += [f"{self.indentation()}other&: {inst.other}"]
-        result += [f"{self.indentation()}parent&: {inst.parent}"]
+        yield f"{self.title()}Interface {hex(id(inst))} name: '{inst.name}'"
+        yield f"{self.indentation()}other&: {inst.other}"
+        yield f"{self.indentation()}parent&: {inst.parent}"
 
         if len(inst._pins) == 0:
-            result += [f"{self.indentation()}pins: []"]
+            yield f"{self.indentation()}pins: []"
         else:
-            result += [f"{self.indentation()}pins:"]
+            yield f"{self.indentation()}pins:"
         for pin in inst._pins:
             with self.indent(True):
-                result += [f"{self.title()}{pin}"]
-
-        return result
+                yield f"{self.title()}{pin}"
 
     def dump_component(self, inst):
-        result = []
-        result += [f"{self.title()}Component {hex(id(inst))} refdes: '{inst.refdes}' model: {inst.model} ignore_model: {inst.ignore_model}"]
-        result += [f"{self.indentation()}package: '{inst.package}'"]
-        result += [f"{self.indentation()}symbol: '{inst.symbol}'"]
-        result += [f"{self.indentation()}value: '{inst.value}'"]
-        result += [f"{self.indentation()}parent&: {inst.parent}"]
+        yield f"{self.title()}Component {hex(id(inst))} refdes: '{inst.refdes}' model: {inst.model} ignore_model: {inst.ignore_model}"
+        yield f"{self.indentation()}package: '{inst.package}'"
+        yield f"{self.indentation()}symbol: '{inst.symbol}'"
+        yield f"{self.indentation()}value: '{inst.value}'"
+        yield f"{self.indentation()}parent&: {inst.parent}"
 
         if len(inst._pins) == 0:
-            result += [f"{self.indentation()}pins: {{}}"]
+            yield f"{self.indentation()}pins: {{}}"
         else:
-            result += [f"{self.indentation()}pins:"]
+            yield f"{self.indentation()}pins:"
         for pin in inst._pins:
             with self.indent(True):
-                result += [f"{self.title()}'{pin}' =>"]
+                yield f"{self.title()}'{pin}' =>"
                 with self.indent():
-                    result += self.dump(inst._pins[pin])
-
-        return result
+                    yield from self.dump(inst._pins[pin])
 
     def dump_pin(self, inst: Pin):
-        result = []
-        result += [f"{self.title()}Pin {hex(id(inst))} number: {inst.number} name: {inst.name}"]
-        result += [f"{self.indentation()}parent&: {inst.parent}"]
-        result += [f"{self.indentation()}wire&: {inst._wire}"]
+        yield f"{self.title()}Pin {hex(id(inst))} number: {inst.number} name: {inst.name}"
+        yield f"{self.indentation()}parent&: {inst.parent}"
+        yield f"{self.indentation()}wire&: {inst._wire}"
 
         if len(inst._interfaces) == 0:
-            result += [f"{self.indentation()}interfaces&: []"]
+            yield f"{self.indentation()}interfaces&: []"
         else:
-            result += [f"{self.indentation()}interfaces&:"]
+            yield f"{self.indentation()}interfaces&:"
         for interface in inst._interfaces:
             with self.indent(True):
-                result += [f"{self.title()}{interface}"]
-
-        return result
+                yield f"{self.title()}{interface}"
 
     def dump_wire(self, inst):
-        result = []
-        result += [f"{self.title()}Wire {hex(id(inst))} name: '{inst.name}' type: {inst.type.name}"]
-        result += [f"{self.indentation()}parent&: {inst.parent}"]
+        yield f"{self.title()}Wire {hex(id(inst))} name: '{inst.name}' type: {inst.type.name}"
+        yield f"{self.indentation()}parent&: {inst.parent}"
 
         if len(inst._pins) == 0:
-            result += [f"{self.indentation()}pins: []"]
+            yield f"{self.indentation()}pins: []"
         else:
-            result += [f"{self.indentation()}pins:"]
+            yield f"{self.indentation()}pins:"
         for pin in inst._pins:
             with self.indent(True):
-                result += [f"{self.title()}{pin}"]
-
-        return result
-
-
+                yield f"{self.title()}{pin}"
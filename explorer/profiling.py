@@ -0,0 +1,281 @@
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+
+class Recorder:
+    """
+    The spans and counters recorded while explorer is instrumented.
+
+    A span is a named, timed section of code: reading a board, parsing one of
+    its files, building the netlist, rendering one html page... Spans nest,
+    the time of a span that is not spent in its children is its self time.
+
+    A counter is a named number, added to as explorer goes: components read,
+    pages rendered...
+    """
+    def __init__(self) -> None:
+        self.origin = time.perf_counter_ns()
+        # (name, start, end, thread, args), in nanoseconds since origin
+        self.spans: list[tuple[str, int, int, int, dict]] = list()
+        self.counters: dict[str, int] = dict()
+
+    def trace(self):
+        """
+        Return the spans and counters as chrome trace events, to be viewed in
+        chrome://tracing or https://ui.perfetto.dev
+        """
+        pid = os.getpid()
+        events = []
+        for name, start, end, tid, args in self.spans:
+            events.append({"name": name, "ph": "X", "pid": pid, "tid": tid,
+                           "ts": start / 1000, "dur": (end - start) / 1000, "args": args})
+        end = max([span[2] for span in self.spans], default=0)
+        for name, value in self.counters.items():
+            events.append({"name": name, "ph": "C", "pid": pid, "ts": end / 1000, "args": {name: value}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def summary(self):
+        """
+        Return the spans, aggregated by name, and the counters as plain text
+        """
+        calls: dict[str, int] = dict()
+        total: dict[str, int] = dict()
+        own: dict[str, int] = dict()
+        longest: dict[str, int] = dict()
+
+        # Walk the spans of each thread in order, to take the time spent in
+        # the children out of their parent
+        stack: list[list] = list()
+        for name, start, end, tid, _ in sorted(self.spans, key=lambda s: (s[3], s[1], -s[2])):
+            while stack and (stack[-1][3] != tid or stack[-1][2] <= start):
+                stack.pop()
+            if stack:
+                own[stack[-1][0]] -= end - start
+            stack.append([name, start, end, tid])
+
+            calls[name] = calls.get(name, 0) + 1
+            total[name] = total.get(name, 0) + end - start
+            own[name] = own.get(name, 0) + end - start
+            longest[name] = max(longest.get(name, 0), end - start)
+
+        lines = [f"{'span':<40}{'calls':>8}{'total s':>10}{'self s':>10}{'mean ms':>10}{'max ms':>10}"]
+        for name in sorted(total, key=total.get, reverse=True):
+            lines.append(f"{name:<40}{calls[name]:>8}{total[name] / 1e9:>10.3f}{own[name] / 1e9:>10.3f}"
+                         f"{total[name] / calls[name] / 1e6:>10.3f}{longest[name] / 1e6:>10.3f}")
+
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<40}{'value':>8}")
+            for name in sorted(self.counters):
+                lines.append(f"{name:<40}{self.counters[name]:>8}")
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, trace: str | None = None, summary: str | None = None):
+        if trace is not None:
+            with open(trace, "w") as f:
+                json.dump(self.trace(), f)
+        if summary is not None:
+            with open(summary, "w") as f:
+                f.write(self.summary())
+
+# The recorder in use. None unless explorer is instrumented
+_recorder: Recorder | None = None
+# The stats being gathered, innermost last. Empty out of stats() blocks
+_stats: list[Stats] = list()
+# The hot paths, as they were before the first of the stats() blocks in
+# progress wrapped them. The lock guards both lists, as blocks of several
+# threads may overlap and end in any order
+_originals: list[tuple[type, str, object]] = list()
+_stats_lock = threading.Lock()
+
+@contextmanager
+def span(name: str, **args):
+    """
+    Record the time spent in the block, or in the decorated function, as a
+    span. Does next to nothing when explorer is not instrumented.
+    """
+    recorder = _recorder
+    if recorder is None:
+        yield
+        return
+
+    start = time.perf_counter_ns() - recorder.origin
+    try:
+        yield
+    finally:
+        end = time.perf_counter_ns() - recorder.origin
+        recorder.spans.append((name, start, end, threading.get_ident(), args))
+
+def count(name: str, value: int = 1):
+    """
+    Add value to a counter, when explorer is instrumented or stats are being
+    gathered
+    """
+    recorder = _recorder
+    if recorder is not None:
+        recorder.counters[name] = recorder.counters.get(name, 0) + value
+    for result in _stats:
+        result.counters[name] = result.counters.get(name, 0) + value
+
+@contextmanager
+def instrument(trace: str | None = None, summary: str | None = None):
+    """
+    instrument(trace=None, summary=None)
+
+    Record the spans and counters of everything explorer does in the block.
+
+    Parameters
+    ----------
+    trace: str, named, default: None
+        When given, write the spans and counters there as a chrome trace.
+    summary: str, named, default: None
+        When given, write the spans and counters there as plain text.
+
+    The recorder is also returned, to look at it directly:
+    ```
+    with instrument(trace='out/trace.json') as recorder:
+        board = read_orcad('netlist/')
+        write_html(system, 'out/')
+    print(recorder.summary())
+    ```
+
+    Setting the EXPLORER_TRACE environment variable to a file instruments the
+    whole python session instead. The chrome trace is written to that file,
+    and the summary next to it, with a .txt extension.
+    """
+    global _recorder
+
+    previous = _recorder
+    recorder = Recorder()
+    _recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _recorder = previous
+        recorder.write(trace, summary)
+
+class Stats:
+    """
+    How many times each of the model hot paths was called, and the counters
+    added to meanwhile: the unions and finds of the netlist...
+    """
+    def __init__(self) -> None:
+        self.calls: dict[str, int] = dict()
+        self.counters: dict[str, int] = dict()
+
+    def __getitem__(self, name: str) -> int:
+        if name in self.calls:
+            return self.calls[name]
+        return self.counters.get(name, 0)
+
+    def report(self):
+        """
+        Return the call counts as plain text, the most called first, then the
+        counters
+        """
+        lines = [f"{'call':<50}{'count':>10}"]
+        for name in sorted(self.calls, key=self.calls.get, reverse=True):
+            lines.append(f"{name:<50}{self.calls[name]:>10}")
+
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<50}{'value':>10}")
+            for name in sorted(self.counters):
+                lines.append(f"{name:<50}{self.counters[name]:>10}")
+
+        return "\n".join(lines) + "\n"
+
+    def __repr__(self) -> str:
+        return f"Stats {self.calls} {self.counters}"
+
+def _hot_paths():
+    # Imported here, as the models themselves use this module
+    from explorer import models
+    return [
+        (models.Board, "get_component"),
+        (models.Board, "get_wire"),
+        (models.Board, "get_interface"),
+        (models.Component, "get_pin"),
+        (models.Component, "get_pin_by_name"),
+        (models.Rtl, "get_signal"),
+        (models.Rtl, "get_signal_by_pinloc"),
+        (models.Wire, "connect"),
+        (models.Netlist, "get_net_corresponding_to_wire_or_signal"),
+    ]
+
+def _counted(name: str, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        for result in _stats:
+            result.calls[name] += 1
+        return function(*args, **kwargs)
+    return wrapper
+
+@contextmanager
+def stats():
+    """
+    stats()
+
+    Count the calls to the model hot paths made in the block: the lookups of
+    components, wires, interfaces, pins and signals by name, of pins by
+    number and of signals by pinloc, Wire.connect, and the netlist queries
+    made by the html templates and by scripts. The counters added to in the
+    block are gathered too: netlist.unions and netlist.finds count the unions
+    and finds of the wires Netlist merges.
+
+    The hot paths are only wrapped for the duration of the block. Outside of
+    it, they are left untouched and cost nothing more.
+    ```
+    with stats() as s:
+        write_html(system, 'out/')
+    print(s.report())
+    ```
+
+    When explorer is also instrumented, the counts are added to its counters.
+
+    Blocks may nest, or overlap in several threads: the hot paths are wrapped
+    once, by the first block, and every call counts in all the blocks in
+    progress. They are put back as they were by the last block to end.
+    """
+    result = Stats()
+    with _stats_lock:
+        hot_paths = _hot_paths()
+        for cls, attr in hot_paths:
+            result.calls[f"{cls.__name__}.{attr}"] = 0
+        if not _stats:
+            for cls, attr in hot_paths:
+                _originals.append((cls, attr, cls.__dict__[attr]))
+                setattr(cls, attr, _counted(f"{cls.__name__}.{attr}", cls.__dict__[attr]))
+        _stats.append(result)
+    try:
+        yield result
+    finally:
+        with _stats_lock:
+            _stats.remove(result)
+            if not _stats:
+                for cls, attr, original in reversed(_originals):
+                    setattr(cls, attr, original)
+                _originals.clear()
+        for name, value in result.calls.items():
+            count(f"calls.{name}", value)
+
+def _instrument_from_environment():
+    global _recorder
+
+    trace = os.environ.get("EXPLORER_TRACE")
+    if not trace:
+        return
+
+    _recorder = Recorder()
+    atexit.register(_recorder.write, trace, os.path.splitext(trace)[0] + ".txt")
+
+_instrument_from_environment()
@@ -1,9 +1,12 @@
 
+from __future__ import annotations
 
+import os
 import re
-from itertools import groupby
+import xml.etree.ElementTree as ElementTree
 
 from explorer.models import *
+from explorer.profiling import span, count
 
 def split_line_into_tokens(line):
     """
@@ -28,33 +31,27 @@ def split_line_into_tokens(line):
 
     """
     temp = None
-    for k, g in groupby(enumerate(line.strip()), lambda x: not x[1].isspace()):
-        if k:
-            pos, first_item = next(g)
-            if temp is not None:
-                yield (temp[0], pos-1, temp[1])
-            temp = (pos, first_item + ''.join([x for _, x in g]))
+    for match in re.finditer(r'\S+', line.strip()):
+        if temp is not None:
+            yield (temp[0], match.start()-1, temp[1])
+        temp = (match.start(), match.group())
     yield (temp[0], len(line)-1, temp[1])
 
-def lookahead(it):
+def compile_eagle_9_6_2_report_table(keys):
     """
-    Is the current value of the iterable, the last value? Use this function.
-
-    ```
-    >>> for i, last in lookahead(range(3)):
-    ...     print(i, last)
-    0 False
-    1 False
-    2 True
-    ```
-
+    Compile the regex that matches one row of an Eagle 9.6.2 report table and
+    splits it into its cells.
+
+    Columns are fixed width, and the widths are given by the header. A cell
+    may overflow into the column separator and beyond, in which case the
+    following cells are shifted right. So for each column but the last, match
+    up to `width` characters, then whatever is left of the overflowing word,
+    then skip the separator. The last column takes the rest of the line.
+    Blank lines are not rows.
     """
-    it = iter(it)
-    last = next(it)
-    for val in it:
-        yield last, False
-        last = val
-    yield last, True
+    # Remember key is a tuple similar to this: (9, 18, 'Pad')
+    cells = [f'(.{{0,{key[1] - key[0]}}}\\S*).?' for key in keys[:-1]]
+    return re.compile('^(?=[ \\t]*\\S)' + ''.join(cells) + '(.*)', re.MULTILINE)
 
 def parse_eagle_9_6_2_report_table(lines, keys):
     """
@@ -72,42 +69,16 @@ def parse_eagle_9_6_2_report_table(lines, keys):
              4        SD         in       GND
     ```
 
-    Note key header must already have been parsed
-    """
-
-    vals = []
-    for line in lines:
-        line = line.rstrip()
-        if line == '':
-            continue
-
-        values = []
-        begin = 0
-        # Remember key is a tuple similar to this: (9, 18, 'Pad')
-        for key, last in lookahead(keys):
-            end = begin + key[1] - key[0]
-            if begin >= len(line):
-                values.append('') 
-            elif last or end >= len(line):
-                values.append(line[begin:len(line)].strip())
-            elif line[end].isspace():
-                values.append(line[begin:end].strip())
-            elif not line[end].isspace():
-                value = line[begin:end].strip()
-                extra = 0
-                for char in line[end:]:
-                    if char.isspace():
-                        break
-                    value += char
-                    extra += 1
-                end += extra
-                values.append(value.strip())
-            else:
-                raise ValueError("not supposed to be here")
-            begin = end + 1
-        vals.append(dict(zip((key[2] for key in keys), values)))
-
-    return vals
+    Note key header must already have been parsed.
+
+    Return one tuple per row, holding the cells in the same order as `keys`.
+    """
+    rows = compile_eagle_9_6_2_report_table(keys).findall(''.join(lines))
+    if len(keys) == 1:
+        return [(row.strip(),) for row in rows]
+
+    strip = str.strip
+    return [tuple(map(strip, row)) for row in rows]
 
 class Parser:
     """
@@ -116,12 +87,15 @@ class Parser:
     
     Generate reports by doing File -> Export -> (Netlist | Partlist | Pinlist)
 
+    Each report is parsed into a table first. Once the partlist, the pinlist
+    and the netlist are all in, `build()` merges them on their (Part, Pad)
+    keys and populates the board in one go.
     """
 
-    def __init__(self):
+    def __init__(self, symbols: SymbolTable | None = None):
         self.board = Board()
-        self.keys = []
-        self.vals = []
+        self.symbols = SymbolTable() if symbols is None else symbols
+        self.tables: dict[str, tuple[dict[str, int], list[tuple[str, ...]]]] = dict()
 
     def __call__(self, file):
         lines = (line for line in file)
@@ -130,10 +104,11 @@ class Parser:
         line = next(lines)
         filetype = line.strip()
 
+        keys = []
         version = ''
         for line in lines:
             if re.match(r'(\w+\s{3,}){2,}', line):
-                self.keys = [token for token in split_line_into_tokens(line)]
+                keys = [token for token in split_line_into_tokens(line)]
                 break
             match = re.match(r'EAGLE Version ([\d.]+)', line)
             if match:
@@ -150,85 +125,387 @@ class Parser:
         if version != '9.6.2':
             raise ValueError("Unsupported eagle file version")
 
-        self.vals = parse_eagle_9_6_2_report_table(lines, self.keys)
-        if filetype == 'Netlist':
-            self.parse_netlist_file()
-        elif filetype == 'Pinlist':
-            self.parse_pinlist_file()
-        elif filetype == 'Partlist':
-            self.parse_partlist_file()
-        else:
+        if filetype not in ['Netlist', 'Pinlist', 'Partlist']:
             raise ValueError("how are we here again?")
 
-    def parse_netlist_file(self):
-        net = None
-        for val in self.vals:
-            if (set(['Net', 'Part', 'Pad']) - val.keys()):
-                raise ValueError("Invalid pinlist file")
-
-            if (val['Net'] != ''):
-                net = Wire(val['Net'])
-                self.board.add_wire(net)
-
-            net.connect(self.board.get_component(val['Part']).get_pin(val['Pad']))
-
-    def parse_pinlist_file(self):
+        columns = {key[2]: i for i, key in enumerate(keys)}
+        required = {
+            'Netlist':  ['Net', 'Part', 'Pad'],
+            'Pinlist':  ['Part', 'Pad', 'Pin', 'Net'],
+            'Partlist': ['Part', 'Value', 'Device', 'Package'],
+        }[filetype]
+        if (set(required) - columns.keys()):
+            raise ValueError(f"Invalid {filetype.lower()} file")
+
+        self.tables[filetype] = (columns, parse_eagle_9_6_2_report_table(lines, keys))
+
+    def build(self):
+        """
+        Populate the board with the partlist, the pinlist and the netlist.
+
+        Pins are indexed by (Part, Pad) while the pinlist is read, so that the
+        netlist rows resolve to their pin without going through the board.
+        """
+        for filetype in ['Partlist', 'Pinlist', 'Netlist']:
+            if filetype not in self.tables:
+                raise ValueError(f"{filetype} report is missing")
+
+        symbols = self.symbols
+        board = self.board
+
+        columns, vals = self.tables['Partlist']
+        PART, VALUE, DEVICE, PACKAGE = (columns[key] for key in ['Part', 'Value', 'Device', 'Package'])
+
+        # Parts of the same device, package and value share their definition
+        definitions: dict[tuple[str, str, str], PartDefinition] = dict()
+        components: dict[str, Component] = dict()
+        for val in vals:
+            key = (val[PACKAGE], val[DEVICE], val[VALUE])
+            definition = definitions.get(key)
+            if definition is None:
+                definition = definitions[key] = PartDefinition(*key)
+            comp = Component(val[PART], *key, definition)
+            board.add_component(comp)
+            components[val[PART]] = comp
+
+        columns, vals = self.tables['Pinlist']
+        PART, PAD, PIN, NET = (columns[key] for key in ['Part', 'Pad', 'Pin', 'Net'])
+
+        pins: dict[tuple[str, str], Pin] = dict()
+        unconnected: list[Pin] = list()
+        part = None
         comp = None
+        for val in vals:
+            if (val[PART] != '' or comp == None):
+                part = val[PART]
+                comp = components.get(part)
+                if comp is None:
+                    raise ValueError(f"Part {part} of the pinlist is not in the partlist")
+
+            pin = Pin(symbols(val[PAD]), symbols(val[PIN]), comp)
+            comp.add_pin(pin)
+            pins[part, val[PAD]] = pin
 
-        for val in self.vals:
-            if (set(['Part', 'Pad', 'Pin', 'Net']) - val.keys()):
-                raise ValueError("Invalid pinlist file")
-
-            if (val['Part'] != '' or comp == None):
-                comp = self.board.get_component(val['Part'])
+            if val[NET] == '*** unconnected ***':
+                unconnected.append(pin)
 
-            pin = Pin(val['Pad'], val['Pin'], comp)
-            comp.add_pin(pin)
+        if len(unconnected) != 0:
+            nc = Wire('NC')
+            nc.type = WireType.NC
+            board.add_wire(nc)
+            for pin in unconnected:
+                nc.connect(pin)
 
-            if val['Net'] == '*** unconnected ***':
-                try:
-                    nc = self.board.get_wire('NC')
-                except:
-                    nc = Wire('NC')
-                    nc.type = WireType.NC
-                    self.board.add_wire(nc)
-                nc.connect(comp.get_pin(val['Pad']))
+        columns, vals = self.tables['Netlist']
+        NET, PART, PAD = (columns[key] for key in ['Net', 'Part', 'Pad'])
 
+        net = None
+        for val in vals:
+            if (val[NET] != ''):
+                net = Wire(symbols(val[NET]))
+                board.add_wire(net)
 
-    def parse_partlist_file(self):
-        for val in self.vals:
-            if (set(['Part', 'Value', 'Device', 'Package']) - val.keys()):
-                raise ValueError("Invalid partlist file")
+            pin = pins.get((val[PART], val[PAD]))
+            if pin is None:
+                raise ValueError(f"Pin {val[PART]}.{val[PAD]} of the netlist is not in the pinlist")
+            net.connect(pin)
 
-            comp = Component(val['Part'], val['Package'], val['Device'], val['Value'])
-            self.board.add_component(comp)
+        self.tables.clear()
+        return board
 
-def read_eagle(nets: str, pins: str, parts: str):
+def read_eagle(nets: str, pins: str, parts: str, symbols: SymbolTable | None = None):
     """
     Read eagle report files and populate a board object
+
+    Pin numbers, pin names and wire names are interned through `symbols`, the
+    symbol table of the system the board is meant for.
     """
-    parse = Parser()
+    with span("read_eagle", parts=parts, pins=pins, nets=nets):
+        parse = Parser(symbols)
 
-    with open(parts, 'r') as f:
-        try:
-            parse(f)
-        except (ValueError) as e:
-            print(f"Error parsing {parts}: {str(e)}")
-            return Board()
+        for report in [parts, pins, nets]:
+            with open(report, 'r') as f, span("read_eagle.report", report=report):
+                try:
+                    parse(f)
+                except (ValueError) as e:
+                    print(f"Error parsing {report}: {str(e)}")
+                    return Board()
 
-    with open(pins, 'r') as f:
         try:
-            parse(f)
+            with span("read_eagle.build"):
+                board = parse.build()
         except (ValueError) as e:
-            print(f"Error parsing {pins}: {str(e)}")
+            print(f"Error merging {parts}, {pins} and {nets}: {str(e)}")
             return Board()
 
-    with open(nets, 'r') as f:
+        count("read_eagle.components", len(board.components))
+        count("read_eagle.wires", len(board.wires))
+        return board
+
+def natural_sort_key(text: str):
+    """
+    Eagle lists parts, pads and nets in natural order, ie C1, C2 ... C9, C10.
+    Compare character by character, except that runs of digits are compared
+    as numbers.
+
+    ```
+    >>> sorted(['C10', 'C9', '+5V', '5-GND'], key=natural_sort_key)
+    ['+5V', '5-GND', 'C9', 'C10']
+    ```
+    """
+    return [(48, int(token)) if token[0] in '0123456789' else (ord(token), 0)
+            for token in re.findall(r'[0-9]+|[^0-9]', text.upper())]
+
+class XmlParser:
+    """
+    Parse an eagle schematic (.sch) or board (.brd) and populate an explorer
+    Board object with its content. This is the same board as read_eagle would
+    give from the reports, without having to export them first.
+
+    The file is streamed with iterparse. Elements are discarded as soon as they
+    are consumed, and only what is needed to build the board is kept: the
+    pads of the devices (or packages), the parts and the nets.
+
+    Like eagle does, power pins that are not on any net are implicitly
+    connected to the net named after the pin.
+
+    A board file does not know about schematic symbols and pin names. In that
+    case, component symbols are left empty, and pins are named after pads.
+    """
+
+    def __init__(self, symbols: SymbolTable | None = None):
+        self.board = Board()
+        self.symbols = SymbolTable() if symbols is None else symbols
+
+        # (library, deviceset, device) -> (package, device name, uservalue, [(gate, pin, pad, is power pin)])
+        self.devices: dict[tuple[str, str, str], tuple[str | None, str, bool, list[tuple[str, str, str, bool]]]] = dict()
+        # (library, package) -> [pad]
+        self.packages: dict[tuple[str, str], list[str]] = dict()
+
+        # refdes -> component, and refdes -> (gate, pin) -> [pad]
+        self.components: dict[str, Component] = dict()
+        # (package, symbol, value) -> definition shared by the parts
+        self.definitions: dict[tuple[str, str, str], PartDefinition] = dict()
+        self.connects: dict[str, dict[tuple[str, str], list[str]]] = dict()
+        # net name -> {(refdes, pad)}
+        self.nets: dict[str, set[tuple[str, str]]] = dict()
+        # power pins (refdes, gate, pin), and the ones found on a net
+        self.power_pins: list[tuple[str, str, str]] = list()
+        self.pinrefs: set[tuple[str, str, str]] = set()
+
+    def __call__(self, file):
+        drawing = None
+        library = ''
+        symbol = None
+        symbols = dict()
+        gates = dict()
+        deviceset = None
+        device = None
+        package = None
+        net = None
+
+        stack = []
+        for event, elem in ElementTree.iterparse(file, events=('start', 'end')):
+            if event == 'start':
+                stack.append(elem)
+                if elem.tag in ['schematic', 'board']:
+                    drawing = elem.tag
+                elif elem.tag == 'library':
+                    library = self.library_name(elem)
+                    symbols = dict()
+                elif elem.tag == 'symbol':
+                    symbol = symbols.setdefault(elem.get('name'), dict())
+                elif elem.tag == 'deviceset':
+                    deviceset = elem
+                    gates = dict()
+                elif elem.tag == 'device':
+                    device = (elem.get('package'), [])
+                elif elem.tag == 'package' and drawing == 'board':
+                    package = []
+                elif elem.tag in ['net', 'signal']:
+                    net = self.nets.setdefault(self.symbols(elem.get('name')), set())
+                continue
+
+            stack.pop()
+            if elem.tag == 'pin' and symbol is not None:
+                symbol[elem.get('name')] = elem.get('direction', 'io')
+            elif elem.tag == 'symbol':
+                symbol = None
+            elif elem.tag == 'gate':
+                gates[elem.get('name')] = symbols.get(elem.get('symbol'), {})
+            elif elem.tag == 'connect':
+                gate, pin = elem.get('gate'), elem.get('pin')
+                power = gates.get(gate, {}).get(pin) == 'pwr'
+                for pad in elem.get('pad').split():
+                    device[1].append((gate, pin, pad, power))
+            elif elem.tag == 'device':
+                key = (library, deviceset.get('name'), elem.get('name', ''))
+                self.devices[key] = (device[0], key[2], deviceset.get('uservalue') == 'yes', device[1])
+            elif elem.tag in ['pad', 'smd'] and package is not None:
+                package.append(elem.get('name'))
+            elif elem.tag == 'package' and package is not None:
+                self.packages[library, elem.get('name')] = package
+                package = None
+            elif elem.tag == 'part':
+                self.parse_part(elem)
+            elif elem.tag == 'element':
+                self.parse_element(elem)
+            elif elem.tag == 'pinref':
+                part, gate, pin = elem.get('part'), elem.get('gate'), elem.get('pin')
+                self.pinrefs.add((part, gate, pin))
+                for pad in self.connects.get(part, {}).get((gate, pin), []):
+                    net.add((part, pad))
+            elif elem.tag == 'contactref':
+                net.add((elem.get('element'), elem.get('pad')))
+
+            # Done with this element, and with its siblings that came before
+            elem.clear()
+            if stack:
+                del stack[-1][:]
+
+        if drawing is None:
+            raise ValueError("Not an eagle schematic or board")
+
+    def definition(self, package: str, symbol: str, value: str):
+        """
+        The definition shared by the parts of the same device, package and value
+        """
+        key = (package, symbol, value)
+        definition = self.definitions.get(key)
+        if definition is None:
+            definition = self.definitions[key] = PartDefinition(*key)
+        return definition
+
+    def library_name(self, elem):
+        if elem.get('urn') is None:
+            return elem.get('name')
+        return f"{elem.get('name')}@{elem.get('urn')}"
+
+    def parse_part(self, elem):
+        library = elem.get('library')
+        if elem.get('library_urn') is not None:
+            library = f"{library}@{elem.get('library_urn')}"
+        deviceset = elem.get('deviceset')
+
+        device = self.devices.get((library, deviceset, elem.get('device', '')))
+        if device is None:
+            raise ValueError(f"Device of part {elem.get('name')} not found")
+        package, variant, uservalue, connects = device
+
+        # Supply symbols, frames, fiducials and such have no package or no
+        # pads. Eagle leaves them out of the reports, so do we
+        if package is None or len(connects) == 0:
+            return
+
+        # Device name, with technology and variant substituted in
+        name = deviceset
+        technology = elem.get('technology', '')
+        name = name.replace('*', technology) if '*' in name else name + technology
+        name = name.replace('?', variant) if '?' in name else name + variant
+
+        value = elem.get('value')
+        if value is None:
+            value = '' if uservalue else name
+
+        refdes = elem.get('name')
+        self.components[refdes] = Component(refdes, package, name, value, self.definition(package, name, value))
+        self.connects[refdes] = dict()
+        for gate, pin, pad, power in connects:
+            self.connects[refdes].setdefault((gate, pin), []).append(pad)
+            if power:
+                self.power_pins.append((refdes, gate, pin))
+
+    def parse_element(self, elem):
+        library = elem.get('library')
+        if elem.get('library_urn') is not None:
+            library = f"{library}@{elem.get('library_urn')}"
+        package = elem.get('package')
+
+        pads = self.packages.get((library, package))
+        if pads is None:
+            raise ValueError(f"Package of element {elem.get('name')} not found")
+        if len(pads) == 0:
+            return
+
+        refdes = elem.get('name')
+        value = elem.get('value', '')
+        self.components[refdes] = Component(refdes, package, '', value, self.definition(package, '', value))
+        self.connects[refdes] = {('', pad): [pad] for pad in pads}
+
+    def build(self):
+        """
+        Populate the board, in the order eagle uses in its reports
+        """
+        symbols = self.symbols
+        board = self.board
+
+        # Pin names are unique within a gate, eagle appends @1, @2 ... to
+        # names that would otherwise clash. Drop that suffix, as reports do
+        def pin_name(name: str):
+            return name.split('@')[0]
+
+        for (refdes, gate, pin) in self.power_pins:
+            if (refdes, gate, pin) in self.pinrefs:
+                continue
+            net = self.nets.setdefault(symbols(pin_name(pin)), set())
+            for pad in self.connects[refdes][gate, pin]:
+                net.add((refdes, pad))
+
+        pins: dict[tuple[str, str], Pin] = dict()
+        for refdes in sorted(self.components, key=natural_sort_key):
+            comp = self.components[refdes]
+            board.add_component(comp)
+
+            names = {pad: pin for (_, pin), pads in self.connects[refdes].items() for pad in pads}
+            for pad in sorted(names, key=natural_sort_key):
+                pin = Pin(symbols(pad), symbols(pin_name(names[pad])), comp)
+                comp.add_pin(pin)
+                pins[refdes, pad] = pin
+
+        connected = set()
+        for nodes in self.nets.values():
+            connected.update(nodes)
+
+        unconnected = [pin for key, pin in pins.items() if key not in connected]
+        if len(unconnected) != 0:
+            nc = Wire('NC')
+            nc.type = WireType.NC
+            board.add_wire(nc)
+            for pin in unconnected:
+                nc.connect(pin)
+
+        for name in sorted(self.nets, key=natural_sort_key):
+            nodes = [node for node in self.nets[name] if node in pins]
+            if len(nodes) == 0:
+                continue
+
+            wire = Wire(name)
+            board.add_wire(wire)
+            for node in sorted(nodes):
+                wire.connect(pins[node])
+
+        return board
+
+def read_eagle_xml(path: str, symbols: SymbolTable | None = None):
+    """
+    Read an eagle schematic or board file and populate a board object
+
+    Pin numbers, pin names and wire names are interned through `symbols`, the
+    symbol table of the system the board is meant for.
+    """
+    with span("read_eagle_xml", path=path):
+        parse = XmlParser(symbols)
+        parse.board.name = os.path.splitext(os.path.basename(path))[0]
+
         try:
-            parse(f)
-        except (ValueError) as e:
-            print(f"Error parsing {nets}: {str(e)}")
+            with span("read_eagle_xml.parse"):
+                parse(path)
+            with span("read_eagle_xml.build"):
+                board = parse.build()
+        except (ValueError, ElementTree.ParseError) as e:
+            print(f"Error parsing {path}: {str(e)}")
             return Board()
 
-    return parse.board
-
+        count("read_eagle_xml.components", len(board.components))
+        count("read_eagle_xml.wires", len(board.wires))
+        return board
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import re
 
-from typing import Union, Optional
+from typing import NamedTuple, Union, Optional
 from explorer.models import *
+from explorer.profiling import span, count
 
 from enum import Enum
 
@@ -86,29 +90,17 @@ class TokenType(Enum):
     INVALID         = 'INVALID'
 
 
-class Token:
-    def __init__(self, type: TokenType, value: str, lineno: int, column: int):
-        self.type = type
-        self.value = value
-        self.lineno = lineno
-        self.column = column
-
-    def __str__(self):
-        """
-        String representation of the Token instance.
-        Example:
-            >>> Token(TokenType.INTEGER, 7, lineno=5, column=10)
-            Token(INTEGER, 7, position=5:10)
-        """
-        return 'Token({type}, {value}, position={lineno}:{column})'.format(
-            type=self.type,
-            value=repr(self.value),
-            lineno=self.lineno,
-            column=self.column,
-        )
+class Token(NamedTuple):
+    """
+    A token, and where it starts in the text.
 
-    def __repr__(self):
-        return self.__str__()
+    pstxnet.dat files make tens of millions of them: tokens are plain tuples,
+    the value of punctuation is the shared TokenType value, and the line and
+    column of a token are only worked out, by the lexer, to report an error.
+    """
+    type: TokenType
+    value: str
+    pos: int
 
 
 def _build_reserved_keywords():
@@ -127,140 +119,213 @@ def _build_reserved_keywords():
 
 RESERVED_KEYWORDS = _build_reserved_keywords()
 
+# Token types that can be the key of a key = 'value' property. Properties
+# explorer does not know about are lexed as plain identifiers
+PROPERTY_KEYS = frozenset([TokenType.ID, *RESERVED_KEYWORDS.values()])
+
+
+# ====================
+#   PROPERTY TABLES
+# ====================
+
+def _unquote(value: str):
+    return value[1:-1]
+
+def _part_type(value: str):
+    return {
+        "'IO'": ComponentType.Connector,
+        "'DISCRETE'": ComponentType.Discrete,
+        "'IC'": ComponentType.Chip,
+    }.get(value, ComponentType.Default)
+
+# For each section, the properties explorer makes use of: property -> (field,
+# conversion of the quoted value). Any other property is parsed, and ignored
+
+PSTCHIP_PIN_PROPERTIES = {
+    'PIN_NUMBER': ('numbers', lambda value: value[2:-2]),
+}
+
+PSTCHIP_BODY_PROPERTIES = {
+    'PART_NAME': ('symbol', _unquote),
+    'JEDEC_TYPE': ('package', _unquote),
+    'VALUE': ('value', _unquote),
+    'CLASS': ('type', _part_type),
+}
+
+PSTXPRT_DIRECTIVES = {
+    'PST_VERSION': ('version', str),
+    'ROOT_DRAWING': ('root', _unquote),
+}
+
 # =========
 #   LEXER
 # =========
 
+# Whitespace and comments, then the next token. Comments go from { to } or to
+# the end of the line. Strings go from ' to the first ' followed by a line
+# break, a colon, a comma or a semicolon, or to the end of the text.
+TOKEN_PATTERN = re.compile(r"""
+    (?:\s+|\{[^}\r\n]*[}\r\n]?)*
+    (?:
+        (?P<string>'.*?'(?=[\r\n:,;])|'.*)
+      | (?P<id>[^\W_][\w-]*)
+      | (?P<punctuation>[=;:(),.])
+      | (?P<invalid>.)
+    )?
+""", re.VERBOSE | re.DOTALL)
+
+# The token type of each punctuation character
+PUNCTUATION = {token_type.value: token_type for token_type in TokenType if len(token_type.value) == 1}
+
+
 class Lexer:
 
     def __init__(self, text):
         self.text = text
         self.pos = 0
-        self.current_char = self.text[self.pos]
-        self.lineno = 1
-        self.column = 1
 
-    def error(self):
+    def position(self, pos: int):
+        """Return the line and column of pos, both starting at 1"""
+        return self.text.count('\n', 0, pos) + 1, pos - self.text.rfind('\n', 0, pos)
+
+    def describe(self, token: Token):
+        """
+        String representation of a token, with its position.
+        Example:
+            Token(TokenType.ID, 'R1', position=5:10)
+        """
+        lineno, column = self.position(token.pos)
+        return f'Token({token.type}, {token.value!r}, position={lineno}:{column})'
+
+    def error(self, pos: int):
+        lineno, column = self.position(pos)
         s = "Lexer error on '{lexeme}' line: {lineno} column: {column}".format(
-            lexeme=self.current_char,
-            lineno=self.lineno,
-            column=self.column,
+            lexeme=self.text[pos],
+            lineno=lineno,
+            column=column,
         )
         raise LexerError(message=s)
 
-    def advance(self):
-        """Advance the `pos` pointer and set the `current_char` variable."""
-        if self.current_char == '\n':
-            self.lineno += 1
-            self.column = 0
-
-        self.pos += 1
-        if self.pos > len(self.text) - 1:
-            self.current_char = ""  # Indicates end of input
-        else:
-            self.current_char = self.text[self.pos]
-            self.column += 1
-
-    def peek(self):
-        pos = self.pos + 1
-        if pos > len(self.text) - 1:
-            return ""
-        else:
-            return self.text[pos]
+    def skip_to(self, pos: int):
+        """Move the `pos` pointer forward to pos"""
+        self.pos = pos
 
-    def skip_whitespace(self):
-        while self.current_char != "" and self.current_char.isspace():
-            self.advance()
+    def next_token(self, ignore_strings:bool=False):
+        """
+        get the next token, skipping whitespace and comments.
 
-    def _string(self):
-        """Handle strings"""
+        Strings are single tokens, unless ignore_strings is set: their quotes
+        are then lexed as TICK tokens.
+        """
+        match = TOKEN_PATTERN.match(self.text, self.pos)
+        self.pos = match.end()
+        kind = match.lastgroup
+
+        if kind == 'id':
+            value = match.group(kind)
+            token_type = RESERVED_KEYWORDS.get(value.upper())
+            if token_type is None:
+                return Token(TokenType.ID, value, match.start(kind))
+            # reserved keyword
+            return Token(token_type, token_type.value, match.start(kind))
 
-        # Create a new token with current line and column number
-        token = Token(TokenType.INVALID, "", self.lineno, self.column)
+        if kind == 'punctuation':
+            token_type = PUNCTUATION[self.text[match.start(kind)]]
+            return Token(token_type, token_type.value, match.start(kind))
 
-        value = self.current_char
-        self.advance()
+        if kind == 'string':
+            if ignore_strings:
+                self.pos = match.start(kind) + 1
+                return Token(TokenType.TICK, TokenType.TICK.value, match.start(kind))
+            return Token(TokenType.STRING, match.group(kind), match.start(kind))
 
-        while self.current_char != "":
-            if self.current_char == "'" and self.peek() in ['\r','\n',':',',',';']:
-                break
-            value += self.current_char
-            self.advance()
+        if kind == 'invalid':
+            self.error(match.start(kind))
 
-        value += self.current_char
-        self.advance()
+        # if we r here, its an eof
+        return Token(TokenType.EOF, "", self.pos)
 
-        token.type = TokenType.STRING
-        token.value = value
 
-        return token
+# =========
+#   CACHE
+# =========
 
-    def _id(self):
-        """Handle identifiers and reserved keywords"""
+class PrimitiveCache:
+    """
+    The parsed pstchip.dat primitives, by hash of their text.
+
+    Projects built from a same company library share most of their pstchip.dat
+    primitives: each of them only needs be parsed once. Parsed primitives are
+    kept in memory for the rest of the process. They are only kept on disk,
+    for the next processes, when EXPLORER_CACHE_DIR is set: in
+    $EXPLORER_CACHE_DIR/pstchip. A file that cannot be read back is parsed
+    again.
+
+    Primitives are kept as plain tuples of (identifier, package, symbol,
+    value, type, pins), and each board gets part definitions of its own built
+    from them: changing the definitions of a board does not change the next
+    boards read.
+    """
 
-        # Create a new token with current line and column number
-        token = Token(TokenType.INVALID, "", self.lineno, self.column)
+    # Bump whenever the parsing of primitives changes, to not reuse stale ones
+    VERSION = 1
 
-        value = ''
-        while self.current_char != "":
-            if not self.current_char.isalnum() and self.current_char not in ['_','-']:
-                break
-            value += self.current_char
-            self.advance()
+    def __init__(self, folder: str | None = None):
+        self.folder = folder
+        self.primitives: dict[str, tuple[str, str, str, str, ComponentType, tuple[tuple[str, str], ...]]] = dict()
 
-        token_type = RESERVED_KEYWORDS.get(value.upper())
-        if token_type is None:
-            token.type = TokenType.ID
-            token.value = value
-        else:
-            # reserved keyword
-            token.type = token_type
-            token.value = value.upper()
+    @staticmethod
+    def default_folder():
+        folder = os.environ.get('EXPLORER_CACHE_DIR')
+        return os.path.join(folder, 'pstchip') if folder else None
 
-        return token
+    def key(self, text: str):
+        return hashlib.sha256(f'{self.VERSION}\n{text}'.encode('utf-8')).hexdigest()
 
-    def next_token(self, ignore_strings:bool=False):
+    def get(self, key: str):
         """
-        get the next token. it takes no arguments, or 4 arguments
-        In the latter case, next_token() scans the input stream until `until`
-        is met. In that case, it returns the `expected` as token.
-
-        THis is used to parse verbatim sections. We know the next token should
-        be verbatim. So tell the lexer to keep parsing until the next `}` is
-        found. Also does nest in and out. Check the code.
+        Return the (identifier, package, symbol, value, type, pins) of a
+        primitive, or None
         """
-        while self.current_char != "":
-
-            if self.current_char == '{':
-                while self.current_char not in ['}' ,'\r', '\n']:
-                    self.advance()
-                self.advance() # skip the closing }
-
-            if self.current_char.isspace():
-                self.skip_whitespace()
-                continue
-
-            if self.current_char == "'" and ignore_strings is False:
-                return self._string()
-
-            if self.current_char.isalnum():
-                return self._id()
+        primitive = self.primitives.get(key)
+        if primitive is not None or self.folder is None:
+            return primitive
 
-            try:
-                # get enum member by value
-                token_type = TokenType(self.current_char)
-            except ValueError:
-                # no enum member with value equal to self.current_char
-                self.error()
-            else:
-                # create a token with a single-character lexeme as its value
-                token = Token(token_type, token_type.value, self.lineno, self.column)
-                self.advance()
-                return token
+        # Anything but a file as put writes it, truncated, of another version
+        # or edited by hand, is a miss
+        try:
+            with open(os.path.join(self.folder, key[:2], f'{key}.json'), 'r') as f:
+                data = json.load(f)
+            primitive = (data['identifier'], data['package'], data['symbol'], data['value'],
+                         ComponentType(data['type']), tuple((number, name) for number, name in data['pins']))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        self.primitives[key] = primitive
+        return primitive
+
+    def put(self, key: str, identifier: str, definition: PartDefinition):
+        # A copy: the definition itself belongs to the board being read
+        self.primitives[key] = (identifier, definition.package, definition.symbol, definition.value,
+                                definition.type, tuple(definition.pins))
+        if self.folder is None:
+            return
+
+        data = {'identifier': identifier, 'package': definition.package, 'symbol': definition.symbol,
+                'value': definition.value, 'type': int(definition.type), 'pins': definition.pins}
+        file = os.path.join(self.folder, key[:2], f'{key}.json')
+        try:
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            with open(f'{file}.{os.getpid()}', 'w') as f:
+                json.dump(data, f)
+            os.replace(f'{file}.{os.getpid()}', file)
+        except OSError:
+            pass
 
-        # if we r here, its an eof
-        return Token(TokenType.EOF, "", self.lineno, self.column)
+PRIMITIVE_CACHE = PrimitiveCache(PrimitiveCache.default_folder())
 
+# The end of a primitive, where its text stops
+END_OF_PRIMITIVE = re.compile(r"end_primitive\s*;", re.IGNORECASE)
 
 # ==========
 #   PARSER
@@ -268,12 +333,14 @@ class Lexer:
 
 class Parser:
 
-    def __init__(self):
+    def __init__(self, symbols: SymbolTable | None = None, cache: PrimitiveCache | None = None):
         self.lexer: Lexer | None = None
         self.current_token: Token | None = None
         self.queue_of_tokens = []
 
         self.parts = dict()
+        self.symbols = SymbolTable() if symbols is None else symbols
+        self.cache = cache
 
         self.board = Board()
 
@@ -291,7 +358,7 @@ class Parser:
         else:
             message = error.value.format(**args)
 
-        raise ParserError(f'{token} -> {message}')
+        raise ParserError(f'{self.lexer.describe(token)} -> {message}')
 
     def __call__(self, file):
         self.lexer = Lexer(file.read())
@@ -361,7 +428,34 @@ class Parser:
         self.consume(TokenType.SEMICOLON)
 
         while self.current_token.type != TokenType.END:
-            self.parse_pstchip_primitive()
+            if self.cache is None or self.current_token.type != TokenType.PRIMITIVE or self.queue_of_tokens:
+                self.parse_pstchip_primitive()
+                continue
+
+            # The primitive goes from its PRIMITIVE keyword to its END_PRIMITIVE;
+            start = self.current_token.pos
+            end = END_OF_PRIMITIVE.search(self.lexer.text, start)
+            if end is None:
+                self.parse_pstchip_primitive()
+                continue
+
+            key = self.cache.key(self.lexer.text[start:end.end()])
+            primitive = self.cache.get(key)
+            if primitive is None:
+                identifier = self.parse_pstchip_primitive()
+                self.cache.put(key, identifier, self.parts[identifier])
+                count("read_orcad.primitives_parsed")
+                continue
+
+            # Already parsed: skip its text. Pin numbers and names are interned
+            # in this parser's symbol table, as if they had been parsed
+            identifier, package, symbol, value, type, pins = primitive
+            symbols = self.symbols
+            self.parts[identifier] = PartDefinition(package, symbol, value, type,
+                                                    [(symbols(number), symbols(name)) for number, name in pins])
+            self.lexer.skip_to(end.end())
+            self.current_token = self.lexer.next_token()
+            count("read_orcad.primitives_cached")
 
         self.consume(TokenType.END)
         self.consume(TokenType.DOT)
@@ -377,148 +471,36 @@ class Parser:
 
         self.consume(TokenType.PIN)
         while self.current_token.type != TokenType.ENDPIN:
-            pinname = self.current_token.value[1:-1]
+            pinname = self.symbols(self.current_token.value[1:-1])
             self.consume(TokenType.STRING)
             self.consume(TokenType.COLON)
 
-            # The pin number(s) for that pin name
-            self.consume(TokenType.PINNUMBER)
-            self.consume(TokenType.EQUALS)
-            pinnumbers = self.current_token.value[2:-2]
-            self.consume(TokenType.STRING)
-            self.consume(TokenType.SEMICOLON)
-
-            if self.current_token.type == TokenType.INPUT_LOAD:
-                self.consume(TokenType.INPUT_LOAD)
-                self.consume(TokenType.EQUALS)
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
-
-            if self.current_token.type == TokenType.OUTPUT_LOAD:
-                self.consume(TokenType.OUTPUT_LOAD)
-                self.consume(TokenType.EQUALS)
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
-
-            if self.current_token.type == TokenType.OUTPUT_TYPE:
-                self.consume(TokenType.OUTPUT_TYPE)
-                self.consume(TokenType.EQUALS)
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
-
-            if self.current_token.type == TokenType.BIDIRECTIONAL:
-                self.consume(TokenType.BIDIRECTIONAL)
-                self.consume(TokenType.EQUALS)
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
-
-            if self.current_token.type == TokenType.PINUSE:
-                self.consume(TokenType.PINUSE)
-                self.consume(TokenType.EQUALS)
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
+            pin = self.parse_statements(PSTCHIP_PIN_PROPERTIES, {TokenType.STRING, TokenType.ENDPIN})
+            if 'numbers' not in pin:
+                self.error(Error.Expecting_this_got_that, [TokenType.PINNUMBER])
 
             # 'If you have a multisection part, then the pin numbers containing
             # that pin name are separated by commas.'
-            for pinnumber in pinnumbers.split(','):
+            for pinnumber in pin['numbers'].split(','):
                 if pinnumber == '0':
                     continue
 
-                pins += [(pinnumber, pinname)]
+                pins += [(self.symbols(pinnumber), pinname)]
 
         self.consume(TokenType.ENDPIN)
         self.consume(TokenType.SEMICOLON)
 
-        package = ''
-        symbol = ''
-        value = 'None'
-        parttype = ComponentType.Default
         self.consume(TokenType.BODY)
-        while self.current_token.type != TokenType.ENDBODY:
-            if self.current_token.type == TokenType.ID:
-                self.consume(TokenType.ID)
-                self.consume(TokenType.EQUALS)
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
-
-            self.consume(TokenType.PARTNAME)
-            self.consume(TokenType.EQUALS)
-            symbol = self.current_token.value[1:-1]
-            self.consume(TokenType.STRING)
-            self.consume(TokenType.SEMICOLON)
-            
-            self.consume(TokenType.JEDECTYPE)
-            self.consume(TokenType.EQUALS)
-            package = self.current_token.value[1:-1]
-            self.consume(TokenType.STRING)
-            self.consume(TokenType.SEMICOLON)
-            
-            if self.current_token.type == TokenType.CLASS:
-                self.consume(TokenType.CLASS)
-                self.consume(TokenType.EQUALS)
-
-                clazz = self.current_token.value
-                if clazz == "'IO'":
-                    parttype = ComponentType.Connector
-                elif clazz == "'DISCRETE'":
-                    parttype = ComponentType.Discrete
-                elif clazz == "'IC'":
-                    parttype = ComponentType.Chip
-                else:
-                    parttype = ComponentType.Default
-
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
-            
-            if self.current_token.type == TokenType.SWAP_INFO:
-                self.consume(TokenType.SWAP_INFO)
-                self.consume(TokenType.EQUALS)
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
-
-            if self.current_token.type == TokenType.VALUE:
-                self.consume(TokenType.VALUE)
-                self.consume(TokenType.EQUALS)
-                value = self.current_token.value[1:-1]
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
-
-            if self.current_token.type == TokenType.PARTNUMBER:
-                self.consume(TokenType.PARTNUMBER)
-                self.consume(TokenType.EQUALS)
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
-
-            if self.current_token.type == TokenType.ALTSYMBOLS:
-                self.consume(TokenType.ALTSYMBOLS)
-                self.consume(TokenType.EQUALS)
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
-
-            if self.current_token.type == TokenType.CLASS:
-                self.consume(TokenType.CLASS)
-                self.consume(TokenType.EQUALS)
-
-                clazz = self.current_token.value
-                if clazz == "'IO'":
-                    parttype = ComponentType.Connector
-                elif clazz == "'DISCRETE'":
-                    parttype = ComponentType.Discrete
-                elif clazz == "'IC'":
-                    parttype = ComponentType.Chip
-                else:
-                    parttype = ComponentType.Default
-
-                self.consume(TokenType.STRING)
-                self.consume(TokenType.SEMICOLON)
-
+        body = self.parse_statements(PSTCHIP_BODY_PROPERTIES, {TokenType.ENDBODY})
         self.consume(TokenType.ENDBODY)
         self.consume(TokenType.SEMICOLON)
         
         self.consume(TokenType.ENDPRIMITIVE)
         self.consume(TokenType.SEMICOLON)
 
-        self.parts[identifier] = { 'identifier': identifier, 'package': package, 'symbol': symbol, 'value': value, 'type': parttype, 'pins': pins }
+        self.parts[identifier] = PartDefinition(body.get('package', ''), body.get('symbol', ''), body.get('value', 'None'),
+                                                body.get('type', ComponentType.Default), pins)
+        return identifier
 
     def parse_pstxnet_file(self):
         """
@@ -556,7 +538,7 @@ class Parser:
     def parse_pstxnet_netname(self):
         self.consume(TokenType.NETNAME)
 
-        wire = Wire(self.current_token.value[1:-1])
+        wire = Wire(self.symbols(self.current_token.value[1:-1]))
         if wire.name == 'NC':
             wire.type = WireType.NC
 
@@ -585,11 +567,8 @@ class Parser:
             self.consume(TokenType.STRING)
             self.consume(TokenType.COLON)
 
-            if self.current_token.type == TokenType.ID:
-                self.consume(TokenType.ID)
-                self.consume(TokenType.EQUALS)
-                self.consume(TokenType.STRING)
-
+            # Node properties
+            self.parse_properties()
             self.consume(TokenType.SEMICOLON)
 
 
@@ -618,33 +597,11 @@ class Parser:
         self.consume(TokenType.SEMICOLON)
 
         self.consume(TokenType.DIRECTIVES)
-        
-        # PST_VERSION directive
-        self.consume(TokenType.PST_VERSION)
-        self.consume(TokenType.EQUALS)
-        if self.current_token.value != "'PST_HDL_CENTRIC_VERSION_0'":
+        directives = self.parse_statements(PSTXPRT_DIRECTIVES, {TokenType.END_DIRECTIVES})
+        if directives.get('version') != "'PST_HDL_CENTRIC_VERSION_0'":
             self.error(Error.Expecting_this_got_that,["'PST_HDL_CENTRIC_VERSION_0'"])
-        self.consume(TokenType.STRING)
-        self.consume(TokenType.SEMICOLON)
-
-        # ROOT_DRAWING directive
-        self.consume(TokenType.ROOT_DRAWING)
-        self.consume(TokenType.EQUALS)
-        self.board.name = self.current_token.value[1:-1]
-        self.consume(TokenType.STRING)
-        self.consume(TokenType.SEMICOLON)
-
-        # POST_TIME directive
-        self.consume(TokenType.POST_TIME)
-        self.consume(TokenType.EQUALS)
-        self.consume(TokenType.STRING)
-        self.consume(TokenType.SEMICOLON)
-
-        # SOURCE_TOOL directive
-        self.consume(TokenType.SOURCE_TOOL)
-        self.consume(TokenType.EQUALS)
-        self.consume(TokenType.STRING)
-        self.consume(TokenType.SEMICOLON)
+        if 'root' in directives:
+            self.board.name = directives['root']
 
         self.consume(TokenType.END_DIRECTIVES)
         self.consume(TokenType.SEMICOLON)
@@ -678,22 +635,43 @@ class Parser:
             self.parse_properties()
             self.consume(TokenType.SEMICOLON)
 
-        part = self.parts[name[1:-1]]
-        component = Component(refdes, part['package'], part['symbol'], part['value'])
-        component.type = part['type']
-        for pin in part['pins']:
-            component.add_pin(Pin(pin[0], pin[1], component))
+        component = Component.from_definition(refdes, self.parts[name[1:-1]])
 
         if 'NO_XNET_CONNECTION' in properties:
             component.ignore_model = True
 
         self.board.add_component(component)
 
+    def parse_statements(self, table: dict, stop: set[TokenType]):
+        """
+        Parse key = 'value' ; statements until one of the `stop` token. Return
+        the fields of the properties found in `table`, converted
+        """
+        fields = {}
+        while self.current_token.type not in stop:
+            if self.current_token.type not in PROPERTY_KEYS:
+                self.error(Error.Unexpected_token)
+            field = table.get(self.current_token.value)
+            self.consume()
+            self.consume(TokenType.EQUALS)
+
+            if field is not None:
+                fields[field[0]] = field[1](self.current_token.value)
+            self.consume(TokenType.STRING)
+            self.consume(TokenType.SEMICOLON)
+
+        return fields
+
     def parse_properties(self):
+        """
+        Parse comma separated key = 'value' properties, up to the semicolon
+        """
         properties = {}
         while self.current_token.type != TokenType.SEMICOLON:
+            if self.current_token.type not in PROPERTY_KEYS:
+                self.error(Error.Unexpected_token)
             name = self.current_token.value
-            self.consume(TokenType.ID)
+            self.consume()
             self.consume(TokenType.EQUALS)
 
             value = self.current_token.value
@@ -707,37 +685,30 @@ class Parser:
         return properties
 
 
-def read_orcad(folder: str):
+def read_orcad(folder: str, symbols: SymbolTable | None = None, cache: bool = True):
     """
     Read orcad netlist
-    """
 
-    parse = Parser()
+    Pin numbers, pin names and wire names are interned through `symbols`, the
+    symbol table of the system the board is meant for.
 
-    # Orcad netlist folder will consist of these files: pstchip, pstxprt and
-    # pstxnet that we each parse in turn
-    pstchip_dat = os.path.join(folder, 'pstchip.dat')
-    with open(pstchip_dat, 'r') as f:
-        try:
-            parse(f)
-        except (ValueError, LexerError, ParserError) as e:
-            print(f"Error parsing pstchip.dat: {str(e)}")
-            return Board()
-
-    pstxprt_dat = os.path.join(folder, 'pstxprt.dat')
-    with open(pstxprt_dat, 'r') as f:
-        try:
-            parse(f)
-        except (ValueError, LexerError, ParserError) as e:
-            print(f"Error parsing pstxprt.dat: {str(e)}")
-            return Board()
-
-    pstxnet_dat = os.path.join(folder, 'pstxnet.dat')
-    with open(pstxnet_dat, 'r') as f:
-        try:
-            parse(f)
-        except (ValueError, LexerError, ParserError) as e:
-            print(f"Error parsing pstxnet.dat: {str(e)}")
-            return Board()
+    The pstchip.dat primitives already parsed, by this process or by a previous
+    one, are not parsed again unless `cache` is False. See PrimitiveCache.
+    """
 
-    return parse.board
\ No newline at end of file
+    with span("read_orcad", folder=folder):
+        parse = Parser(symbols, PRIMITIVE_CACHE if cache else None)
+
+        # Orcad netlist folder will consist of these files: pstchip, pstxprt and
+        # pstxnet that we each parse in turn
+        for dat in ['pstchip.dat', 'pstxprt.dat', 'pstxnet.dat']:
+            with open(os.path.join(folder, dat), 'r') as f, span(f"read_orcad.{dat[:-4]}"):
+                try:
+                    parse(f)
+                except (ValueError, LexerError, ParserError) as e:
+                    print(f"Error parsing {dat}: {str(e)}")
+                    return Board()
+
+        count("read_orcad.components", len(parse.board.components))
+        count("read_orcad.wires", len(parse.board.wires))
+        return parse.board
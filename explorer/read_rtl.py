@@ -1,9 +1,9 @@
 
-
 from __future__ import annotations
 import re
 
-from explorer.models import Rtl
+from explorer.models import Rtl, Component, bind_rtls
+from explorer.profiling import span, count
 
 def read_rtl(from_xlnx_io: str):
     """
@@ -13,10 +13,81 @@ def read_rtl(from_xlnx_io: str):
     Read a xilinx io report and return an explorer rtl object. This object can
     then be added into the explorer models.
     """
-    return _read_rtl_from_xlnx_io_report(from_xlnx_io)
+    with span("read_rtl", path=from_xlnx_io):
+        return _read_rtl_from_xlnx_io_report(from_xlnx_io)
+
+def read_rtls(from_xlnx_io: list[str], fpgas: list[Component] | None = None, max_workers: int | None = 1):
+    """
+
+    read_rtls(from_xlnx_io, ...)
+
+    Read many xilinx io reports at once, and return the corresponding explorer
+    rtl objects, in the same order.
+
+    Parameters
+    ----------
+    from_xlnx_io: list[str] - required
+        The xilinx io reports.
+    fpgas: list[Component], named, default: None
+        When given, the fpga each rtl belongs to. The rtls are then linked to
+        their fpga, by bind_rtls.
+    max_workers: int, named, default: 1
+        Reports are parsed in this process by default. Otherwise, in parallel
+        by that many worker processes, None for the number of cpus: only worth
+        it for many large reports on many cpus. Worker processes need the
+        script to be guarded by `if __name__ == "__main__":` on macOS and
+        windows.
+
+    Returns
+    -------
+    rtls: list[Rtl | None]
+        The rtls. None for the reports that could not be parsed.
+    """
+    if fpgas is not None and len(fpgas) != len(from_xlnx_io):
+        raise RuntimeError("there must be one fpga per io report")
+
+    with span("read_rtls", reports=len(from_xlnx_io)):
+        with span("read_rtls.parse"):
+            if max_workers == 1 or len(from_xlnx_io) <= 1:
+                tables = [_read_xlnx_io_report(io_rpt) for io_rpt in from_xlnx_io]
+            else:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    tables = list(executor.map(_read_xlnx_io_report, from_xlnx_io))
+
+        rtls = [None if table is None else _rtl_from_signals(table) for table in tables]
+
+        for io_rpt, rtl in zip(from_xlnx_io, rtls):
+            if rtl is None:
+                print(f"Error parsing {io_rpt}: not a xilinx io report")
+            else:
+                count("read_rtl.signals", len(rtl.signals))
+
+        if fpgas is not None:
+            with span("read_rtls.bind"):
+                bind_rtls((fpga, rtl) for fpga, rtl in zip(fpgas, rtls) if rtl is not None)
+
+    return rtls
 
 def _read_rtl_from_xlnx_io_report(io_rpt):
+    table = _read_xlnx_io_report(io_rpt)
+    if table is None:
+        return
+    return _rtl_from_signals(table)
+
+def _rtl_from_signals(table: list[tuple[str, str]]):
     rtl = Rtl()
+    for sig, loc in table:
+        rtl.add_signal(sig, loc)
+    return rtl
+
+def _read_xlnx_io_report(io_rpt):
+    """
+    Return the (Signal Name, Pin Number) of every assigned pin of a xilinx io
+    report, or None if the report is malformed.
+
+    Only these two columns are extracted, using their offsets in the header.
+    """
     cols = []
     keys = []
     vals = []
@@ -40,25 +111,21 @@ def _read_rtl_from_xlnx_io_report(io_rpt):
         if line != table_delimiter:
             return
 
-        # This is the table
+        if 'Signal Name' not in keys or 'Pin Number' not in keys:
+            return vals
+        sl, su = cols[keys.index('Signal Name')]
+        pl, pu = cols[keys.index('Pin Number')]
+
+        # This is the table. Any postamble after it is of no interest
         for line in file:
             if line.strip() == table_delimiter:
                 break
-            values = [line[l:u].strip() for l,u in cols]
-            vals.append(dict(zip(keys, values)))
-
-        # Any postamble? Parse em here
-        for line in file:
-            pass
-
-    for value in vals:
-        if 'Signal Name' not in value or 'Pin Number' not in value:
-            continue
-        sig = value['Signal Name']
-        loc = value['Pin Number']
-        if sig == '' or loc == '':
-            continue
-        rtl.add_signal(sig, loc)
-
-    return rtl
-
+            sig = line[sl:su].strip()
+            if sig == '':
+                continue
+            loc = line[pl:pu].strip()
+            if loc == '':
+                continue
+            vals.append((sig, loc))
+
+    return vals
@@ -5,6 +5,7 @@ import hashlib
 import os
 
 from explorer.models import *
+from explorer.profiling import span
 
 class State:
     connectivity_index = 1
@@ -28,6 +29,7 @@ class Connectivity(Report):
         template = env.get_template("write_html_connectivity_template.jinja2")
         return template.render(title=self.title, starting=self.starting, to=self.to, netlist=netlist,system=system)
 
+@span("write_html")
 def write_html(system: System, *args, **kwargs):
     """
     write_html(system, ...)
@@ -66,27 +68,27 @@ def write_html(system: System, *args, **kwargs):
 
     file = f'{folder}/index.html'
     os.makedirs(os.path.dirname(file), exist_ok=True)
-    with open(file, "w") as f:
+    with open(file, "w") as f, span("write_html.page", page=file):
         template = env.get_template("write_html_system_template.jinja2")
         f.write(template.render(system=system, extra=extra))
 
     for brd in system.boards:
         file = f'{folder}/{brd.identifier}.html'
         os.makedirs(os.path.dirname(file), exist_ok=True)
-        with open(file, "w") as f:
+        with open(file, "w") as f, span("write_html.page", page=file):
             template = env.get_template("write_html_board_template.jinja2")
             f.write(template.render(board=brd, netlist=netlist))
 
     for rtl in system.rtls:
         file = f'{folder}/{rtl.name}.html'
         os.makedirs(os.path.dirname(file), exist_ok=True)
-        with open(file, "w") as f:
+        with open(file, "w") as f, span("write_html.page", page=file):
             template = env.get_template("write_html_rtl_template.jinja2")
             f.write(template.render(rtl=rtl, netlist=netlist))
 
     for x in extra:
         file = f'{folder}/connectivity-{x.id}.html'
         os.makedirs(os.path.dirname(file), exist_ok=True)
-        with open(file, "w") as f:
+        with open(file, "w") as f, span("write_html.page", page=file):
             f.write(x(env, netlist, system))
 
@@ -1,7 +1,9 @@
 
 import json
 
-from explorer import *
+from explorer.models import System, Rtl, Signal, Board, Interface, Component, Pin, Wire, Net, Netlist
+from explorer.algorithms import depth_first
+from explorer.profiling import span, count
 
 class Serialize:
     def __init__(self, system: System) -> None:
@@ -16,7 +18,7 @@ class Serialize:
             for rtl in obj.rtls:
                 res["rtls"] += [id(rtl)]
             for net in self.netlist.nets.values():
-                res["nets"] += [id(net)]
+                res["nets"] += [net.key]
             self.result[id(obj)] = res
             self.result['root'] = id(obj)
 
@@ -70,25 +72,29 @@ class Serialize:
             self.result[id(obj)] = res
 
         if isinstance(obj, Wire):
-            res = {"id": id(obj), "kind": "wire", "name": obj.name, "type": obj.type, "parent": id(obj.parent), "pins": [], "net": id(self.netlist.get_net_corresponding_to_wire_or_signal(obj))}
+            res = {"id": id(obj), "kind": "wire", "name": obj.name, "type": obj.type, "parent": id(obj.parent), "pins": [], "net": self.netlist.get_net_corresponding_to_wire_or_signal(obj).key}
             for pin in obj._pins:
                 if isinstance(pin, Pin) is False:
                     continue
                 res["pins"] += [id(pin)]
             self.result[id(obj)] = res
 
+        # Nets are identified by their key, the same from a run to the next,
+        # where the other models are identified by their id()
         if isinstance(obj, Net):
-            res = {"id": id(obj), "kind": "net", "things": []}
+            res = {"id": obj.key, "kind": "net", "net_number": obj.net_number, "things": []}
             for thing in obj._things:
                 res["things"] += [id(thing)]
-            self.result[id(obj)] = res
+            self.result[obj.key] = res
 
 def write_json(system: System, file: str):
 
-    serialize_and_add_id = Serialize(system)
-    with open(file, "w") as f:
-        for model in depth_first(system):
-            serialize_and_add_id(model)
-        f.write(json.dumps({"models": serialize_and_add_id.result}))
-
-
+    with span("write_json", file=file):
+        serialize_and_add_id = Serialize(system)
+        with open(file, "w") as f:
+            with span("write_json.serialize"):
+                for model in depth_first(system):
+                    serialize_and_add_id(model)
+            with span("write_json.dump"):
+                f.write(json.dumps({"models": serialize_and_add_id.result}))
+        count("write_json.models", len(serialize_and_add_id.result))
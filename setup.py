@@ -7,8 +7,8 @@ setup(name="explorer",
       url="https://github.com/dj1mm/explorer",
       author="Jimmy Ah Fat",
       author_email="j.ahfat95@gmail.com",
-      packages=find_packages(),
+      packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
       package_data={"explorer": [ "*.jinja2" ]},
-      install_requires=["disjoint_set", "Jinja2"],
+      install_requires=["Jinja2"],
       python_requires=">=3.7.4",
 )
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+
+from explorer import *
+from benchmarks.generate import SyntheticBoard
+
+pytestmark = pytest.mark.perf
+
+# The inputs grow by GROWTH between two measurements. A linear phase takes
+# about GROWTH times longer, a quadratic one GROWTH**2 times longer: a phase
+# fails when it takes more than SLACK times what linear would
+GROWTH = 4
+SLACK = 2
+SIZE = 150
+
+def best_of(fn, repeats: int = 3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def make_board(folder: str, size: int):
+    synthetic = SyntheticBoard(f'brd{size}', parts=size, pins=16, nets=3 * size, fpgas=1, fpga_pins=5 * size)
+    synthetic.write_eagle(os.path.join(folder, 'eagle'))
+    synthetic.write_orcad(os.path.join(folder, 'orcad', synthetic.name))
+    return synthetic
+
+def read_eagle_board(folder: str, synthetic: SyntheticBoard):
+    return read_eagle(*[os.path.join(folder, 'eagle', f'{synthetic.name}.{ext}') for ext in ['nets', 'pins', 'parts']])
+
+def make_system(folder: str, synthetic: SyntheticBoard):
+    board = read_eagle_board(folder, synthetic)
+    board.identifier = synthetic.name
+    system = System()
+    system.add_board(board)
+    return system
+
+# Each phase is set up on a board, and returns what is to be timed
+
+def phase_read_eagle(folder: str, synthetic: SyntheticBoard):
+    return lambda: read_eagle_board(folder, synthetic)
+
+def phase_read_orcad(folder: str, synthetic: SyntheticBoard):
+    return lambda: read_orcad(os.path.join(folder, 'orcad', synthetic.name))
+
+def phase_lookups(folder: str, synthetic: SyntheticBoard):
+    board = read_eagle_board(folder, synthetic)
+    def lookups():
+        for component in board.components:
+            board.get_component(component.refdes)
+        for wire in board.wires:
+            board.get_wire(wire.name)
+    return lookups
+
+def phase_netlist(folder: str, synthetic: SyntheticBoard):
+    system = make_system(folder, synthetic)
+    return lambda: Netlist(system)
+
+def phase_write_html(folder: str, synthetic: SyntheticBoard):
+    system = make_system(folder, synthetic)
+    return lambda: write_html(system, os.path.join(folder, 'html'))
+
+def phase_write_json(folder: str, synthetic: SyntheticBoard):
+    system = make_system(folder, synthetic)
+    return lambda: write_json(system, os.path.join(folder, 'system.json'))
+
+PHASES = {
+    'read_eagle': phase_read_eagle,
+    'read_orcad': phase_read_orcad,
+    'lookups':    phase_lookups,
+    'netlist':    phase_netlist,
+    'write_html': phase_write_html,
+    'write_json': phase_write_json,
+}
+
+@pytest.mark.parametrize("phase", PHASES)
+def test_scaling(phase, tmp_path):
+    small = make_board(str(tmp_path), SIZE)
+    large = make_board(str(tmp_path), SIZE * GROWTH)
+
+    t_small = best_of(PHASES[phase](str(tmp_path), small))
+    t_large = best_of(PHASES[phase](str(tmp_path), large))
+
+    ratio = t_large / t_small
+    assert ratio < GROWTH * SLACK, \
+        f"{phase} grows faster than linear: {t_small:.3f}s -> {t_large:.3f}s for {GROWTH}x the input"
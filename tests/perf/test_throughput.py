@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+import pytest
+
+from benchmarks.run import run
+
+pytestmark = pytest.mark.perf
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Phases of benchmarks.run whose throughput is guarded
+PHASES = ['read_eagle', 'read_orcad', 'read_rtl', 'netlist', 'write_html', 'write_json']
+
+# Iterations of the calibration loop
+CALIBRATION = 200000
+
+@pytest.fixture(scope="module")
+def baseline():
+    with open(BASELINE, 'r') as f:
+        return json.load(f)
+
+def calibration():
+    """
+    A fixed loop of the dict, list and string work explorer is made of, that
+    does not depend on explorer
+    """
+    table: dict[str, list[int]] = dict()
+    for i in range(CALIBRATION):
+        table.setdefault(f"N{i % 5000}", []).append(i)
+    return len(table)
+
+@pytest.fixture(scope="module")
+def throughput(baseline, request):
+    """
+    Pins per second of every phase, best of a few runs on the baseline's
+    synthetic system, relative to the iterations per second of the
+    calibration loop on the same machine. The baseline then holds across
+    machines, where pins per second would not
+    """
+    best = {}
+    for _ in range(baseline['repeats']):
+        start = time.perf_counter()
+        calibration()
+        best['calibration'] = min(best.get('calibration', float('inf')), time.perf_counter() - start)
+        results = run(**baseline['parameters'], memory=False)
+        for phase in results['phases']:
+            best[phase['name']] = min(best.get(phase['name'], float('inf')), phase['seconds'])
+    speed = CALIBRATION / best['calibration']
+    measured = {name: results['pins'] / best[name] / speed for name in PHASES}
+
+    if request.config.getoption("--perf-update"):
+        baseline['throughput'] = {name: float(f"{value:.3g}") for name, value in measured.items()}
+        with open(BASELINE, 'w') as f:
+            json.dump(baseline, f, indent=2)
+            f.write('\n')
+
+    return measured
+
+@pytest.mark.parametrize("phase", PHASES)
+def test_throughput(phase, baseline, throughput):
+    expected = baseline['throughput'][phase]
+    minimum = expected * (1 - baseline['tolerance'])
+    assert throughput[phase] >= minimum, \
+        f"{phase} regressed: {throughput[phase]:.3g} pins per calibration iteration, baseline is {expected}"
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+
+import json
+
+import pytest
+
+from explorer import *
+
+def read():
+    my_system = System()
+    for identifier in ["mega", "base"]:
+        board = read_eagle(f'tests/{identifier}/{identifier}.nets', f'tests/{identifier}/{identifier}.pins', f'tests/{identifier}/{identifier}.parts')
+        board.identifier = identifier
+        my_system.add_board(board)
+    return my_system
+
+def test_main():
+    assert not diff(read(), read())
+
+    before = json.loads(json.dumps(snapshot(read())))
+    after = read()
+    base = after.get_board("base")
+
+    u2 = base.get_component("U2")
+    name, wire = u2.get_pin("1").name, u2.get_pin("1").wire.name
+    u2.get_pin("1")._name = "renamed"
+    base.add_component(Component("TP1", "TP", "TP", "TP"))
+    new = Wire("NEW")
+    base.add_wire(new)
+    new.type = WireType.DC
+
+    # Mate the first pins of both boards, their wires are merged into nets
+    mate(after.get_board("mega").get_component("PWMH"), u2)
+
+    changes = diff(before, after)
+    assert changes.of("changed") == [Change("changed", "pin", "base.U2.1", [name, wire], ["renamed", wire])]
+    assert [change.path for change in changes.of("added", "component")] == ["base.TP1"]
+    assert [change.path for change in changes.of("added", "wire")] == ["base.NEW"]
+    assert changes.of("removed") == [] and changes.of("split") == []
+
+    merged = changes.of("merged", "net")
+    assert len(merged) > 0
+    for change in merged:
+        assert any(key.startswith("mega.") for key in change.before)
+        assert any(key.startswith("base.") for key in change.before)
+
+    # And back
+    assert [change.path for change in diff(after, before).of("removed", "component")] == ["base.TP1"]
+    assert len(diff(after, before).of("split", "net")) == len(merged)
+    assert changes.report().count("\n") == len(changes)
+
+def test_boards():
+    # Two boards are compared whatever their identifiers
+    lhs, rhs = read().get_board("base"), read().get_board("base")
+    rhs.identifier = "base2"
+    assert not diff(lhs, rhs)
+    rhs.add_wire(Wire("NEW"))
+    assert [change.path for change in diff(lhs, rhs)] == ["base2.NEW"]
+    assert [change.path for change in diff(json.loads(json.dumps(snapshot(rhs))), lhs)] == ["base.NEW"]
+
+    # Boards of a system must be told apart
+    my_system = read()
+    my_system.get_board("mega").identifier = "base"
+    with pytest.raises(RuntimeError):
+        snapshot(my_system)
+    my_system.get_board("base").identifier = ""
+    with pytest.raises(RuntimeError):
+        diff(my_system, read())
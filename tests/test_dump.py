@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+
+import pytest
+
+from explorer import *
+
+def test_main(tmp_path, capsys):
+    my_system = System()
+    for identifier in ["mega", "base"]:
+        board = read_eagle(f'tests/{identifier}/{identifier}.nets', f'tests/{identifier}/{identifier}.pins', f'tests/{identifier}/{identifier}.parts')
+        board.identifier = identifier
+        my_system.add_board(board)
+
+    Dump(my_system, str(tmp_path / 'system.txt'))
+    Dump(my_system)
+    text = (tmp_path / 'system.txt').read_text()
+    assert capsys.readouterr().out == text + '\n'
+    assert text.startswith("System ")
+    assert "identifier: 'mega'" in text and "identifier: 'base'" in text
+
+    mega = my_system.get_board("mega")
+    mega.get_component("IC3").type = ComponentType.Chip
+    Dump(my_system, str(tmp_path / 'connectors.txt'), boards=['mega'], component_types=[ComponentType.Chip])
+    text = (tmp_path / 'connectors.txt').read_text()
+    assert "identifier: 'mega'" in text and "identifier: 'base'" not in text
+    refdes = [line.split("refdes: '")[1].split("'")[0] for line in text.splitlines() if "refdes: '" in line]
+    assert refdes == ["IC3"]
+
+def test_boards(tmp_path):
+    my_system = System()
+    for identifier in ["mega", "base"]:
+        board = read_eagle(f'tests/{identifier}/{identifier}.nets', f'tests/{identifier}/{identifier}.pins', f'tests/{identifier}/{identifier}.parts')
+        board.identifier = identifier
+        my_system.add_board(board)
+    rtl = read_rtl('tests/mega/mega_io.rpt')
+    rtl.name = "mega_fpga"
+    bind_rtls([("IC3", rtl)], board=my_system.get_board("mega"))
+
+    # The rtls bound to boards left out are left out too
+    Dump(my_system, str(tmp_path / 'base.txt'), boards=['base'])
+    assert "mega_fpga" not in (tmp_path / 'base.txt').read_text()
+    Dump(my_system, str(tmp_path / 'mega.txt'), boards=['mega'])
+    assert "Rtl " in (tmp_path / 'mega.txt').read_text()
+
+    # Boards are only filtered in a system
+    with pytest.raises(RuntimeError):
+        Dump(my_system.get_board("mega"), str(tmp_path / 'board.txt'), boards=['base'])
+    assert not (tmp_path / 'board.txt').exists()
@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+
+import subprocess
+import sys
+
+def imported_by(statement):
+    code = f"{statement}\nimport sys\nprint(' '.join(sys.modules))"
+    process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return set(process.stdout.split())
+
+def test_main():
+    # Submodules are only imported when one of their names is used
+    modules = imported_by("import explorer")
+    assert "jinja2" not in modules
+    assert "disjoint_set" not in modules
+    assert "explorer.models" not in modules
+
+    modules = imported_by("from explorer import read_rtl")
+    assert "jinja2" not in modules
+    assert "explorer.read_orcad" not in modules
+
+def test_submodules():
+    # Reached from the package alone, as when it imported them all
+    modules = imported_by("import explorer\n"
+                          "assert explorer.models.Board is explorer.Board\n"
+                          "assert callable(explorer.algorithms.depth_first)\n"
+                          "assert callable(explorer.profiling.stats)")
+    assert "explorer.models" in modules
+
+def test_same_names():
+    import explorer
+    import explorer.read_rtl
+
+    # The submodules named after a function do not hide it
+    assert callable(explorer.read_rtl)
+    assert callable(explorer.write_html)
+    assert "Netlist" in dir(explorer)
+    assert explorer.Board is explorer.models.Board
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+
+import json
+
+from explorer import *
+
+def read_base():
+    return read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+
+def mate(lhs: Board, rhs: Board):
+    lhs_headers = Interface("headers")
+    lhs.add_interface(lhs_headers)
+    rhs_headers = Interface("headers")
+    rhs.add_interface(rhs_headers)
+    for number in ["1", "2", "3", "4"]:
+        lhs_headers.add_pin(lhs.get_component("U2").get_pin(number))
+        rhs_headers.add_pin(rhs.get_component("U2").get_pin(number))
+    lhs_headers.connect(rhs_headers)
+
+def nets(netlist: Netlist):
+    return sorted(sorted((ws.parent.identifier, ws.name) for ws in net._things) for net in set(netlist.nets.values()))
+
+def test_main():
+
+    # Three boards read one by one
+    read_system = System()
+    boards = [read_base() for _ in range(3)]
+    for i, board in enumerate(boards):
+        board.identifier = f"base{i}"
+        read_system.add_board(board)
+    mate(boards[0], boards[1])
+
+    # And three boards instantiated from the first one
+    my_system = System()
+    base0 = read_base()
+    base0.identifier = "base0"
+    instances = [base0, base0.instantiate("base1"), base0.instantiate("base2")]
+    for board in instances:
+        my_system.add_board(board)
+    mate(instances[0], instances[1])
+
+    assert len(instances[2].wires) == len(base0.wires)
+    assert instances[2].wires[0] is not base0.wires[0]
+
+    # Instances have components and pins of their own, sharing their part
+    component = instances[1].get_component("U2")
+    assert component is not base0.get_component("U2")
+    assert component.parent is instances[1]
+    assert component.definition is base0.get_component("U2").definition
+    pin = component.get_pin("1")
+    assert pin.wire.parent is instances[1]
+    assert pin.wire is instances[1].get_wire(pin.wire.name)
+    assert pin.interfaces == [instances[1].get_interface("headers")]
+    assert instances[2].get_component("U2").get_pin("1").interfaces == []
+
+    assert nets(Netlist(my_system)) == nets(Netlist(read_system))
+
+def test_independent():
+    base0 = read_base()
+    base0.identifier = "base0"
+    base1 = base0.instantiate("base1")
+
+    # Changes to an instance are its own, and so are changes to its template
+    test_point = Component("TP1", "TP", "TP", "")
+    test_point.add_pin(Pin("1", "1", test_point))
+    base1.add_component(test_point)
+    wire = Wire("extra")
+    base1.add_wire(wire)
+    wire.connect(test_point.get_pin("1"))
+    base0.add_wire(Wire("other"))
+
+    assert len(base0.wires) == len(base1.wires)
+    assert len(base0.components) == len(base1.components) - 1
+    assert base1.get_wire("extra")._pins == [test_point.get_pin("1")]
+    assert "other" not in [wire.name for wire in base1.wires]
+
+def test_write_json(tmp_path):
+    my_system = System()
+    base0 = read_base()
+    base0.identifier = "base0"
+    base1 = base0.instantiate("base1")
+    my_system.add_board(base0)
+    my_system.add_board(base1)
+    mate(base0, base1)
+
+    write_json(my_system, str(tmp_path / 'system.json'))
+    with open(tmp_path / 'system.json') as f:
+        models = json.load(f)["models"]
+
+    board = models[str(id(base1))]
+    wires = set(board["wires"])
+    interface = models[str(id(base1.get_interface("headers")))]
+    for component in board["components"]:
+        assert models[str(component)]["parent"] == id(base1)
+        for pin in models[str(component)]["pins"]:
+            pin = models[str(pin)]
+            assert pin["parent"] == component
+            assert pin["wire"] is None or pin["wire"] in wires
+            assert pin["interfaces"] in ([], [interface["id"]])
+    assert all(models[str(pin)]["interfaces"] == [interface["id"]] for pin in interface["pins"])
+    assert len(interface["pins"]) == 4
+    assert not set(board["components"]) & set(models[str(id(base0))]["components"])
@@ -1,5 +1,7 @@
 #!/usr/bin/python3
 
+import pytest
+
 from explorer import *
 
 
@@ -74,3 +76,103 @@ def test_main():
     assert base._interfaces[0].other == mega._interfaces[0]
     assert mega._interfaces[0].other == base._interfaces[0]
 
+
+def test_index_of():
+    base = read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+    headers = Interface("headers")
+    base.add_interface(headers)
+    pins = [base.get_component("U2").get_pin(str(number)) for number in (3, 1, 2)]
+    for pin in pins:
+        headers.add_pin(pin)
+
+    assert [headers.index_of(pin) for pin in pins] == [0, 1, 2]
+    with pytest.raises(RuntimeError):
+        headers.add_pin(pins[0])
+    with pytest.raises(RuntimeError):
+        headers.index_of(base.get_component("U2").get_pin("4"))
+
+def test_bulk():
+    mega = read_eagle('tests/mega/mega.nets', 'tests/mega/mega.pins', 'tests/mega/mega.parts')
+    base = read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+    base2 = base.instantiate("base2")
+
+    mega_headers = Interface.from_components("mega_headers", [mega.get_component("PWMH"), mega.get_component("PWML")])
+    assert mega.get_interface("mega_headers") is mega_headers
+    assert mega_headers.pins == list(mega.get_component("PWMH")._pins.values()) + list(mega.get_component("PWML")._pins.values())
+
+    u2 = base.get_component("U2")
+    base_headers = Interface("base_headers")
+    base.add_interface(base_headers)
+    base_headers.add_pins(u2.get_pin(str(number)) for number in range(1, len(mega_headers.pins) + 1))
+    base2_headers = Interface.from_components("base2_headers", [base2.get_component("U2")])
+    assert base2_headers.parent is base2
+    assert base2.get_component("U2").get_pin("1").interfaces == [base2_headers]
+    assert u2.get_pin("1").interfaces == [base_headers]
+
+    # Nothing is added when a pin cannot be
+    with pytest.raises(RuntimeError):
+        base_headers.add_pins([u2.get_pin(str(len(mega_headers.pins) + 1)), u2.get_pin("1")])
+    assert len(base_headers.pins) == len(mega_headers.pins)
+
+    # Nor is an interface built from components that cannot be
+    interfaces = list(base.interfaces)
+    with pytest.raises(RuntimeError):
+        Interface.from_components("bad", ["U2", "NOT_A_REFDES"], board=base)
+    with pytest.raises(RuntimeError):
+        Interface.from_components("bad", [u2, base2.get_component("U2")])
+    with pytest.raises(RuntimeError):
+        Interface.from_components("bad", [u2, u2])
+    assert base.interfaces == interfaces
+    assert len(u2.get_pin("2").interfaces) == 1
+    assert Interface.from_components("by_refdes", ["U2"], board=base).pins == list(u2._pins.values())
+
+    # Nor connected when a pair cannot be
+    other = Interface.from_components("other", [mega.get_component("POWER")])
+    with pytest.raises(RuntimeError):
+        connect_many([(base_headers, mega_headers), (base2_headers, other)])
+    assert base_headers.other is None
+
+    connect_many([(base_headers, mega_headers)])
+    assert base_headers.other is mega_headers and mega_headers.other is base_headers
+    with pytest.raises(RuntimeError):
+        connect_many([(base_headers, mega_headers)])
+
+def test_mate():
+    mega = read_eagle('tests/mega/mega.nets', 'tests/mega/mega.pins', 'tests/mega/mega.parts')
+    base = read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+    pwmh, pwml, adcl, u2 = mega.get_component("PWMH"), mega.get_component("PWML"), mega.get_component("ADCL"), base.get_component("U2")
+
+    lhs, rhs = mate(pwmh, u2)
+    assert mega.get_interface("PWMH") is lhs and base.get_interface("U2") is rhs
+    assert lhs.other is rhs
+    assert [pin.number for pin in rhs.pins] == [pin.number for pin in lhs.pins] == [str(n) for n in range(1, 9)]
+
+    lhs, rhs = mate(pwml, adcl, "mirrored", names=("pwml_adcl", "adcl_pwml"))
+    assert [(l.number, r.number) for l, r in zip(lhs.pins, rhs.pins)] == [(str(n), str(9 - n)) for n in range(1, 9)]
+
+    base2 = base.instantiate("base2")
+    lhs, rhs = mate(adcl, base2.get_component("U2"), lambda number: str(int(number) + 8) if number != "8" else None)
+    assert rhs.parent is base2 and base2.get_component("U2").get_pin("9").interfaces == [rhs]
+    assert [pin.number for pin in rhs.pins] == [str(n) for n in range(9, 16)]
+
+    # Every pin missing is reported at once, and nothing is built
+    with pytest.raises(RuntimeError, match="1->100, 2->200"):
+        mate(mega.get_component("POWER"), u2, {"1": "100", "2": "200"})
+    assert "POWER" not in [interface.name for interface in mega.interfaces]
+
+    # Nor when a board is not that of its connector, or pins are not numbered
+    interfaces = list(mega.interfaces), list(base.interfaces)
+    with pytest.raises(RuntimeError):
+        mate(pwmh, u2, rhs_board=mega)
+    with pytest.raises(RuntimeError):
+        mate("PWMH", "NOT_A_REFDES", lhs_board=mega, rhs_board=base)
+    other = Component("J9", "HDR", "HDR", "")
+    for number in ["1", "2", "3", "4", "5", "6", "7", "A"]:
+        other.add_pin(Pin(number, number, other))
+    base.add_component(other)
+    with pytest.raises(RuntimeError, match="not numbered"):
+        mate(pwml, other, "mirrored")
+    assert (mega.interfaces, base.interfaces) == interfaces
+
+    lhs, rhs = mate("PWMH", "U2", lhs_board=mega, rhs_board=base2, names=("by_refdes", "by_refdes"))
+    assert lhs.parent is mega and rhs.parent is base2
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+
+import json
+
+import pytest
+
+import explorer.models
+
+from explorer import *
+
+def mated():
+    my_system = System()
+
+    mega = read_eagle('tests/mega/mega.nets', 'tests/mega/mega.pins', 'tests/mega/mega.parts')
+    mega.identifier = "mega"
+    my_system.add_board(mega)
+    base = read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+    base.identifier = "base"
+    my_system.add_board(base)
+
+    mega_headers = Interface("mega_headers")
+    mega.add_interface(mega_headers)
+    base_headers = Interface("base_headers")
+    base.add_interface(base_headers)
+    for number in range(1, 9):
+        mega_headers.add_pin(mega.get_component("PWMH").get_pin(str(number)))
+        base_headers.add_pin(base.get_component("U2").get_pin(str(number)))
+    base_headers.connect(mega_headers)
+
+    return my_system, mega, base
+
+def test_main():
+    my_system, mega, base = mated()
+    netlist = Netlist(my_system)
+
+    for board in my_system.boards:
+        for wire in board.wires:
+            assert wire in netlist.get_net_corresponding_to_wire_or_signal(wire)._things
+
+    for number in range(1, 9):
+        lhs = mega.get_component("PWMH").get_pin(str(number)).wire
+        rhs = base.get_component("U2").get_pin(str(number)).wire
+        if lhs is not None and rhs is not None:
+            assert netlist.get_net_corresponding_to_wire_or_signal(lhs) is netlist.get_net_corresponding_to_wire_or_signal(rhs)
+
+    with pytest.raises(ValueError):
+        netlist.get_net_corresponding_to_wire_or_signal(Wire("not_in_the_system"))
+
+def test_numbering():
+    numbering = []
+    for _ in range(2):
+        my_system, mega, base = mated()
+        netlist = Netlist(my_system)
+        nets = sorted(netlist.nets.values(), key=lambda net: net.net_number)
+        assert [net.net_number for net in nets] == list(range(len(nets)))
+        assert [net.key for net in nets] == sorted(net.key for net in nets)
+        for net in nets:
+            assert net.key == min(Net.key_of(thing) for thing in net._things)
+        numbering.append({Net.key_of(wire): netlist.get_net_corresponding_to_wire_or_signal(wire).net_number
+                          for board in my_system.boards for wire in board.wires})
+
+    assert numbering[0] == numbering[1]
+
+def test_keys():
+    # Boards without identifier, and an rtl named as a board, tie on names
+    def system():
+        my_system = System()
+        base = read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+        my_system.add_board(base)
+        my_system.add_board(base.instantiate(""))
+        rtl = Rtl("")
+        rtl.add_signal(base.wires[0].name, "1")
+        bind_rtls([(base.get_component("U2"), rtl)])
+        return my_system
+
+    keys = []
+    for _ in range(2):
+        netlist = Netlist(system())
+        nets = sorted(netlist.nets.values(), key=lambda net: net.net_number)
+        assert len({net.key for net in nets}) == len(nets)
+        keys.append([(net.key, sorted(map(Net.key_of, net._things))) for net in nets])
+    assert keys[0] == keys[1]
+    assert any(key.endswith("~2") for key, _ in keys[0])
+
+    # A new net leaves the keys of the others as they were
+    my_system, mega, base = mated()
+    before = {wire: net.key for wire, net in Netlist(my_system)._nets_by_thing.items()}
+    base.add_wire(Wire("0_first"))
+    after = Netlist(my_system)
+    assert all(after.get_net_corresponding_to_wire_or_signal(wire).key == key for wire, key in before.items())
+
+def test_unions():
+    my_system, mega, base = mated()
+    my_system.add_board(base.instantiate("base2"))
+    for board in (base, my_system.boards[2]):
+        for component in board.components:
+            if len(component._pins) >= 2:
+                component.model = [tuple(list(component._pins)[:2])]
+
+    # Every board shorts its own wires, instances included
+    with stats() as s:
+        netlist = Netlist(my_system)
+    shorts = [len(explorer.models._shorts(board)) for board in my_system.boards]
+    assert shorts[1] == shorts[2] > 0
+    assert s["netlist.unions"] >= sum(shorts)
+    for board in (base, my_system.boards[2]):
+        for component in board.components:
+            if len(component._pins) >= 2:
+                lhs, rhs = (component.get_pin(number).wire for number in list(component._pins)[:2])
+                if lhs is not None and rhs is not None and WireType.DC not in (lhs.type, rhs.type) and WireType.NC not in (lhs.type, rhs.type):
+                    assert netlist.get_net_corresponding_to_wire_or_signal(lhs) is netlist.get_net_corresponding_to_wire_or_signal(rhs)
+
+def test_json(tmp_path):
+    # Nets are identified by their key, the same from a run to the next
+    ids = []
+    for run in range(2):
+        my_system, mega, base = mated()
+        write_json(my_system, str(tmp_path / f'{run}.json'))
+        with open(tmp_path / f'{run}.json') as f:
+            models = json.load(f)["models"]
+        system = models[str(models["root"])]
+        assert all(models[net]["id"] == net for net in system["nets"])
+        assert all(model["net"] in system["nets"] for model in models.values() if isinstance(model, dict) and model["kind"] == "wire")
+        ids.append(sorted(system["nets"]))
+    assert ids[0] == ids[1]
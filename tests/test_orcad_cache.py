@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+
+from explorer import *
+from explorer.read_orcad import Parser, PrimitiveCache
+
+def parse_pstchip(cache):
+    parse = Parser(cache=cache)
+    with open('tests/seniordesign/pstchip.dat', 'r') as f:
+        parse(f)
+    return parse.parts
+
+def definitions(parts):
+    return {identifier: (d.package, d.symbol, d.value, d.type, d.pins) for identifier, d in parts.items()}
+
+def test_main(tmp_path):
+    expected = definitions(parse_pstchip(None))
+
+    # Parsed, then found in memory
+    cache = PrimitiveCache(str(tmp_path))
+    assert definitions(parse_pstchip(cache)) == expected
+    assert len(cache.primitives) == len(expected)
+    assert definitions(parse_pstchip(cache)) == expected
+
+    # Found on disk, by another process
+    cache = PrimitiveCache(str(tmp_path))
+    assert definitions(parse_pstchip(cache)) == expected
+    assert len(cache.primitives) == len(expected)
+
+    # read_orcad only parses the primitives once
+    read_orcad('tests/seniordesign')
+    with instrument() as recorder:
+        board = read_orcad('tests/seniordesign')
+    assert recorder.counters.get("read_orcad.primitives_parsed", 0) == 0
+    assert len(board.components) == len(read_orcad('tests/seniordesign', cache=False).components)
+
+def test_corrupt(tmp_path):
+    expected = definitions(parse_pstchip(None))
+    parse_pstchip(PrimitiveCache(str(tmp_path)))
+    files = sorted(tmp_path.glob('*/*.json'))
+    contents = ['', '{"identifier": "U1"', '[]', '{}', '{"identifier": "U1", "package": "", "symbol": "",'
+                ' "value": "", "type": 0, "pins": [1, 2]}', '{"identifier": "U1", "package": "", "symbol": "",'
+                ' "value": "", "type": 42, "pins": []}']
+    for file, content in zip(files, contents * len(files)):
+        file.write_text(content)
+
+    # Files that cannot be read back are parsed again
+    cache = PrimitiveCache(str(tmp_path))
+    with instrument() as recorder:
+        assert definitions(parse_pstchip(cache)) == expected
+    assert recorder.counters.get("read_orcad.primitives_parsed", 0) == len(files)
+
+def test_default_folder(monkeypatch, tmp_path):
+    monkeypatch.delenv('EXPLORER_CACHE_DIR', raising=False)
+    assert PrimitiveCache.default_folder() is None
+    monkeypatch.setenv('EXPLORER_CACHE_DIR', str(tmp_path))
+    assert PrimitiveCache.default_folder() == str(tmp_path / 'pstchip')
+
+def test_changed_definition(tmp_path):
+    # Changing the definitions of a board leaves the next boards as read
+    cache = PrimitiveCache(str(tmp_path))
+    first = Parser(cache=cache)
+    with open('tests/seniordesign/pstchip.dat', 'r') as f:
+        first(f)
+    expected = definitions(parse_pstchip(None))
+    for definition in first.parts.values():
+        definition.value = 'POISONED'
+        definition.pins = definition.pins[1:]
+    assert definitions(parse_pstchip(cache)) == expected
+
+    board = read_orcad('tests/watersensor')
+    value = board.get_component('J6').value
+    board.get_component('J6').definition.value = 'POISONED'
+    board.get_component('J6').definition.pins = ()
+    assert read_orcad('tests/watersensor').get_component('J6').value == value
@@ -0,0 +1,30 @@
+#!/usr/bin/python3
+
+import pytest
+
+from explorer.read_orcad import Lexer, LexerError, TokenType
+
+def test_main():
+    lexer = Lexer("{ comment }\nNODE_NAME\tR1 '1':\n 'it''s';\n  node_name\n")
+    tokens = []
+    while True:
+        token = lexer.next_token()
+        if token.type == TokenType.EOF:
+            break
+        tokens.append((token.type, token.value, lexer.position(token.pos)))
+
+    assert tokens == [
+        (TokenType.NODENAME, 'NODE_NAME', (2, 1)),
+        (TokenType.ID, 'R1', (2, 11)),
+        (TokenType.STRING, "'1'", (2, 14)),
+        (TokenType.COLON, ':', (2, 17)),
+        (TokenType.STRING, "'it''s'", (3, 2)),
+        (TokenType.SEMICOLON, ';', (3, 9)),
+        (TokenType.NODENAME, 'NODE_NAME', (4, 3)),
+    ]
+
+def test_error():
+    lexer = Lexer("PRIMITIVE\n  $")
+    lexer.next_token()
+    with pytest.raises(LexerError, match="'\\$' line: 2 column: 3"):
+        lexer.next_token()
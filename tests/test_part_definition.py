@@ -0,0 +1,33 @@
+#!/usr/bin/python3
+
+import pytest
+
+from explorer import *
+
+def test_main():
+    r0402 = PartDefinition('0402', 'RES', '10k', ComponentType.Discrete, [('1', '1'), ('2', '2')])
+    r1 = Component.from_definition('R1', r0402)
+    r2 = Component.from_definition('R2', r0402)
+
+    assert r1.definition is r2.definition
+    assert r1.package == '0402' and r1.symbol == 'RES' and r1.value == '10k'
+    assert r1.type == ComponentType.Discrete
+    assert r1.get_pin('1') is not r2.get_pin('1')
+    assert r1.get_pin('2').parent is r1
+    assert r1.get_pin('2').interfaces == []
+    assert r1.get_pin('2').interfaces is not r2.get_pin('2').interfaces
+
+    # Pins are checked as add_pin does, and the part is the definition's
+    with pytest.raises(RuntimeError):
+        Component.from_definition('R3', PartDefinition('0402', 'RES', '10k', pins=[('1', '1'), ('1', '2')]))
+    with pytest.raises(RuntimeError):
+        Component('R3', '0603', 'RES', '10k', r0402)
+    assert Component('R3', '0402', 'RES', '10k', r0402).definition is r0402
+
+def test_readers():
+    seniordesign = read_orcad('tests/seniordesign')
+    assert seniordesign.get_component("C10").definition is seniordesign.get_component("C11").definition
+
+    base = read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+    definitions = {id(component.definition) for component in base.components}
+    assert len(definitions) < len(base.components)
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+
+import json
+import threading
+
+from explorer import *
+
+def test_main(tmp_path):
+    trace = tmp_path / 'trace.json'
+    summary = tmp_path / 'summary.txt'
+
+    with instrument(trace=str(trace), summary=str(summary)) as recorder:
+        base = read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+        base.identifier = "base"
+        my_system = System()
+        my_system.add_board(base)
+        write_html(my_system, str(tmp_path / 'html'))
+        write_json(my_system, str(tmp_path / 'system.json'))
+
+    names = {span[0] for span in recorder.spans}
+    assert {"read_eagle", "read_eagle.report", "read_eagle.build", "netlist",
+            "write_html", "write_html.page", "write_json"} <= names
+    assert recorder.counters["read_eagle.components"] == 24
+    assert recorder.counters["netlist.nets"] > 0
+
+    events = json.loads(trace.read_text())["traceEvents"]
+    assert len([e for e in events if e["ph"] == "X"]) == len(recorder.spans)
+    assert summary.read_text().startswith("span")
+
+    # Nothing is recorded once out of the block
+    read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+    assert len([span for span in recorder.spans if span[0] == "read_eagle"]) == 1
+
+def test_stats(tmp_path):
+    base = read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+    base.identifier = "base"
+    my_system = System()
+    my_system.add_board(base)
+
+    with stats() as s:
+        base.get_component("U2")
+        write_html(my_system, str(tmp_path / 'html'))
+
+    assert s["Board.get_component"] == 1
+    assert s["Netlist.get_net_corresponding_to_wire_or_signal"] >= len(base.wires)
+    assert s["netlist.finds"] >= len(base.wires)
+    assert "netlist.unions" in s.counters
+    assert s.report().startswith("call")
+
+    # The hot paths are left untouched out of the block
+    base.get_component("U2")
+    finds = s["netlist.finds"]
+    Netlist(my_system)
+    assert s["Board.get_component"] == 1
+    assert s["netlist.finds"] == finds
+    assert Board.get_component.__qualname__ == "Board.get_component"
+    assert not hasattr(Board.get_component, "__wrapped__")
+
+def test_stats_overlap():
+    base = read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+    original = Board.__dict__["get_component"]
+
+    # Blocks that end out of order, as those of two threads may, count the
+    # calls made while each of them is in progress, and leave no wrapper
+    first, second = stats(), stats()
+    outer = first.__enter__()
+    base.get_component("U2")
+    inner = second.__enter__()
+    base.get_component("U2")
+    first.__exit__(None, None, None)
+    base.get_component("U2")
+    second.__exit__(None, None, None)
+    base.get_component("U2")
+
+    assert outer["Board.get_component"] == 2
+    assert inner["Board.get_component"] == 2
+    assert Board.__dict__["get_component"] is original
+
+    # Nor does a thread leave one behind
+    barrier = threading.Barrier(2)
+    def gather():
+        with stats() as s:
+            barrier.wait()
+            base.get_component("U2")
+            barrier.wait()
+    threads = [threading.Thread(target=gather) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert Board.__dict__["get_component"] is original
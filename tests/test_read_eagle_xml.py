@@ -0,0 +1,40 @@
+#!/usr/bin/python3
+
+from __future__ import annotations
+
+from explorer import *
+
+def summary(board: Board):
+    components = [(c.refdes, c.package, c.symbol, c.value, [(p.number, p.name) for p in c._pins.values()]) for c in board.components]
+    wires = [(w.name, w.type, [(p.parent.refdes, p.number) for p in w._pins]) for w in board.wires]
+    return components, wires
+
+def test_main():
+    mega = read_eagle_xml('tests/mega/mega.sch')
+    mega.identifier = "mega"
+
+    my_system = System()
+    my_system.add_board(mega)
+
+    # Verify the generated model
+
+    assert mega.name == "mega"
+    assert len(mega._components) == 68
+    assert len(mega._wires) == 108 + 1
+    assert mega.get_component("IC3").get_pin("97").wire == mega.get_wire("ADC0")
+
+    # Power pins that are not on any net get an implicit one
+    assert len(mega.get_wire("5-GND")._pins) == 1
+
+def test_same_as_reports():
+    for name in ['mega', 'base']:
+        from_reports = read_eagle(f'tests/{name}/{name}.nets', f'tests/{name}/{name}.pins', f'tests/{name}/{name}.parts')
+        from_schematic = read_eagle_xml(f'tests/{name}/{name}.sch')
+        assert summary(from_reports) == summary(from_schematic)
+
+def test_board_file():
+    mega = read_eagle_xml('tests/mega/mega.brd')
+
+    assert mega.name == "mega"
+    assert mega.get_component("ADCL").get_pin("1").wire == mega.get_wire("ADC0")
+    assert len(mega.get_wire("ADC0")._pins) == 2
@@ -52,3 +52,13 @@ def test_main():
 
 
 
+
+def test_pins_by_name():
+    mega = read_eagle('tests/mega/mega.nets', 'tests/mega/mega.pins', 'tests/mega/mega.parts')
+    ic3 = mega.get_component("IC3")
+
+    assert ic3.get_pin_by_name("(ADC0)PF0") is ic3.get_pin("97")
+    assert ic3.get_pins_by_name("not a pin") == []
+
+    ic3.add_pin(Pin("1000", "(ADC0)PF0", ic3))
+    assert ic3.get_pins_by_name("(ADC0)PF0") == [ic3.get_pin("97"), ic3.get_pin("1000")]
@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+
+import os
+
+from explorer import *
+
+def test_newer_exports(tmp_path):
+    """
+    Newer orcad exports have properties explorer does not know about. They are
+    parsed, and ignored
+    """
+    def copy(name, *replacements):
+        with open(os.path.join('tests/watersensor', name), 'r') as f:
+            text = f.read()
+        for old, new in replacements:
+            text = text.replace(old, new)
+        with open(tmp_path / name, 'w') as f:
+            f.write(text)
+
+    copy('pstchip.dat',
+         ("      PINUSE='UNSPEC';\n", "      PINUSE='UNSPEC';\n      PIN_GROUP='A';\n"),
+         ("    PART_NAME=", "    ROHS_COMPLIANT='YES';\n    PART_NAME="),
+         ("    VALUE=", "    CLASS='IC';\n    VALUE="))
+    copy('pstxprt.dat',
+         (" SOURCE_TOOL='CAPTURE_WRITER';\n", " SOURCE_TOOL='CAPTURE_WRITER';\n DESIGN_VARIANT='DEFAULT';\n"))
+    copy('pstxnet.dat',
+         (" '5':;", " '5': PIN_TYPE='IO', VALUE='5';"))
+
+    expected = read_orcad('tests/watersensor', cache=False)
+    board = read_orcad(str(tmp_path), cache=False)
+
+    assert board.name == expected.name
+    assert [c.refdes for c in board.components] == [c.refdes for c in expected.components]
+    assert [[p.parent.refdes for p in w._pins] for w in board.wires] == [[p.parent.refdes for p in w._pins] for w in expected.wires]
+    assert board.get_component("J4").type == ComponentType.Chip
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+
+import pytest
+
+from explorer import *
+
+def test_main():
+    rtl = read_rtl('tests/mega/mega_io.rpt')
+
+    # Unassigned pins are not top level signals
+    assert len(rtl.signals) == 8
+    assert rtl.get_signal("adc[0]").pinloc == "97"
+    assert rtl.get_signal("adc[7]").pinloc == "90"
+    assert rtl.get_signal_by_pinloc("97") is rtl.get_signal("adc[0]")
+
+def test_table_end(tmp_path):
+    # The table ends at its delimiter, however indented, and the rows after
+    # it are not read
+    lines = open('tests/mega/mega_io.rpt').read().split('\n')
+    lines[48] = f"  {lines[48]}"
+    lines.insert(49, lines[46].replace("adc[1]", "late  "))
+    (tmp_path / 'io.rpt').write_text('\n'.join(lines))
+
+    rtl = read_rtl(str(tmp_path / 'io.rpt'))
+    assert len(rtl.signals) == 8
+
+def test_many_reports():
+
+    # Create system
+    my_system = System()
+
+    mega = read_eagle('tests/mega/mega.nets', 'tests/mega/mega.pins', 'tests/mega/mega.parts')
+    mega.identifier = "mega"
+    my_system.add_board(mega)
+
+    # Parse in parallel, and link the first rtl to its fpga
+    rtls = read_rtls(['tests/mega/mega_io.rpt', 'tests/mega/mega_io.rpt'], max_workers=2)
+    assert [len(rtl.signals) for rtl in rtls] == [8, 8]
+
+    rtls = read_rtls(['tests/mega/mega_io.rpt'], fpgas=[mega.get_component("IC3")])
+    assert rtls[0].parent == my_system
+    assert rtls[0].other.parent == mega
+    assert rtls[0].other.pins[0] == mega.get_component("IC3").get_pin("97")
+
+def test_bind_rtls():
+    my_system = System()
+    mega = read_eagle('tests/mega/mega.nets', 'tests/mega/mega.pins', 'tests/mega/mega.parts')
+    mega.identifier = "mega"
+    my_system.add_board(mega)
+
+    rtl = read_rtl('tests/mega/mega_io.rpt')
+    broken = Rtl("broken")
+    broken.add_signal("a", "1000")
+    broken.add_signal("b", "97")
+    broken.add_signal("c", "1001")
+
+    # Every missing pin is reported at once, and nothing is linked
+    with pytest.raises(RuntimeError, match=r"IC3.1000 \(broken.a\), IC3.1001 \(broken.c\)"):
+        bind_rtls([(mega.get_component("IC3"), rtl), (mega.get_component("IC3"), broken)])
+    assert my_system.rtls == [] and mega.interfaces == []
+
+    # Nor when signals share a pin, or the board is not part of a system
+    shared = Rtl("shared")
+    shared.add_signal("b", "97")
+    shared.add_signal("a", "97")
+    with pytest.raises(RuntimeError, match="share pins 97"):
+        bind_rtls([(mega.get_component("IC3"), rtl), (mega.get_component("IC3"), shared)])
+    alone = read_eagle('tests/mega/mega.nets', 'tests/mega/mega.pins', 'tests/mega/mega.parts')
+    with pytest.raises(RuntimeError, match="not part of a system"):
+        bind_rtls([(mega.get_component("IC3"), rtl), (alone.get_component("IC3"), broken)])
+    with pytest.raises(RuntimeError):
+        bind_rtls([("IC3", rtl)], board=alone.instantiate("other"))
+    assert my_system.rtls == [] and mega.interfaces == []
+    assert [signal.name for signal in shared.signals] == ["b", "a"]
+
+    bind_rtls([("IC3", rtl)], board=mega)
+    assert my_system.rtls == [rtl]
+    assert [pin.number for pin in rtl.other.pins] == [signal.pinloc for signal in rtl.signals]
@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+
+from explorer import *
+
+def test_main():
+
+    # Create system
+    my_system = System()
+
+    # Read both eagle boards with the system's symbol table
+    mega = read_eagle('tests/mega/mega.nets', 'tests/mega/mega.pins', 'tests/mega/mega.parts', symbols=my_system.symbols)
+    base = read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts', symbols=my_system.symbols)
+    watersensor = read_orcad('tests/watersensor', symbols=my_system.symbols)
+
+    # Pin numbers are shared across components and across boards. CPython
+    # shares one character strings anyway: these are two, and the names longer
+    number = "".join(["1", "0"])
+    assert mega.get_component("IC3").get_pin(number).number is mega.get_component("XIOH").get_pin(number).number
+    assert mega.get_component("IC3").get_pin(number).number is base.get_component("U2").get_pin(number).number
+    assert base.get_component("U2").get_pin(number).number is watersensor.get_component("J6").get_pin(number).number
+
+    # Pin names and wire names too
+    assert mega.get_component("IC3").get_pin("30").name is base.get_component("U2").get_pin("30").name
+    assert mega.get_wire("GND").name is base.get_wire("GND").name
+    assert mega.get_wire("AREF").name is base.get_wire("AREF").name
+
+    # Boards read with a symbol table of their own do not share them
+    other = read_eagle('tests/base/base.nets', 'tests/base/base.pins', 'tests/base/base.parts')
+    assert other.get_component("U2").get_pin(number).number == base.get_component("U2").get_pin(number).number
+    assert other.get_component("U2").get_pin(number).number is not base.get_component("U2").get_pin(number).number
+    assert other.get_wire("AREF").name is not base.get_wire("AREF").name